@@ -1,13 +1,22 @@
 import tkinter as tk
 from tkinter import ttk,messagebox
-import networkx as nx
 import random
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.figure import Figure
-from itertools import combinations
+from matplotlib.collections import LineCollection
+from matplotlib.colors import to_rgba,LinearSegmentedColormap
+import numpy as np
 import threading
 import time
-from dataclasses import dataclass
+import os
+import sys
+import queue
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass,field
+from instrumentation import null_tracer,run_tracer
+sys.path.insert(0,os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import ramsat
 
 @dataclass
 class graph_statistics:
@@ -18,50 +27,186 @@ class graph_statistics:
     blue_edges: int
     cliques_found: dict
 
+@dataclass
+class search_witness:
+    """Last colouring evaluated at the reported n and the clique found in it."""
+    n: int
+    colours: object
+    clique: tuple
+    clique_color: str
+
+@dataclass
+class trial_record:
+    """Progress of the canonical check R(a,b) <= n over the shared trial sequence."""
+    verified: int=0
+    failed_at: int=None
+    witness: search_witness=None
+
+class estimation_cache:
+    """Colourings and trial outcomes shared by every estimation job.
+
+    Trial t at n always uses the same seeded colouring, so jobs reuse each
+    other's colourings and verified trial prefixes. Checks are stored under
+    the sorted pair (a,b); R(k2,k1) reads the same colourings with red and
+    blue exchanged, so R(3,4) and R(4,3) share one entry."""
+    def __init__(self,seed=None,max_colouring_bytes=64 * 2**20):
+        self.seed=seed if seed is not None else random.randrange(2**32)
+        self.max_colouring_bytes=max_colouring_bytes
+        self._colourings=OrderedDict()
+        self._colouring_bytes=0
+        self._trials={}
+        self._lock=threading.Lock()
+    def colouring(self,n,trial):
+        """Return the colour matrix for (n,trial) and whether it was cached."""
+        key=(n,trial)
+        with self._lock:
+            M=self._colourings.get(key)
+            if M is not None:
+                self._colourings.move_to_end(key)
+                return M,True
+        rng=np.random.default_rng((self.seed,n,trial))
+        M=ramsat.colour_matrix(n,rng.integers(0,2,n * (n - 1) // 2,dtype=np.uint8))
+        with self._lock:
+            if key not in self._colourings:
+                self._colourings[key]=M
+                self._colouring_bytes+=M.nbytes
+                while self._colouring_bytes > self.max_colouring_bytes and len(self._colourings) > 1:
+                    _,old=self._colourings.popitem(last=False)
+                    self._colouring_bytes-=old.nbytes
+        return M,False
+    def record(self,n,a,b):
+        """Return the shared trial_record for the canonical pair a <= b."""
+        with self._lock:
+            return self._trials.setdefault((n,a,b),trial_record())
+    def update(self,record,verified=None,failed_at=None,witness=None):
+        """Advance a trial_record under the cache lock."""
+        with self._lock:
+            if verified is not None and verified > record.verified:
+                record.verified=verified
+                if witness is not None:
+                    record.witness=witness
+            elif witness is not None and record.witness is None:
+                record.witness=witness
+            if failed_at is not None and (record.failed_at is None or failed_at < record.failed_at):
+                record.failed_at=failed_at
+
+def _swap_colours(witness):
+    """Return the witness seen with red and blue exchanged."""
+    return search_witness(n=witness.n,colours=witness.colours ^ 1,clique=witness.clique,
+                          clique_color='blue' if witness.clique_color == 'red' else 'red')
+
 class ramsey_calculator:
     """Core calculator for Ramsey numbers using Monte Carlo method."""
-    def __init__(self):
+    def __init__(self,tracer=None,cache=None):
         self.cancel_flag=False
-    def has_monochromatic_clique(self,G,k,color):
-        """Check if graph G contains a monochromatic clique of size k."""
-        nodes=list(G.nodes)
-        if k > len(nodes):
+        self.tracer=tracer if tracer is not None else null_tracer()
+        self.cache=cache if cache is not None else estimation_cache()
+        self.last_witness=None
+    def find_monochromatic_clique(self,M,k,color,codes=None):
+        """Return the first monochromatic k-clique as a vertex tuple, or None.
+
+        ``M`` is the colour matrix (1=red,0=blue) and ``codes`` its packed
+        upper triangle. ramsat tests every k-subset at once for small cases
+        and backtracks over same-colour neighbours for large ones."""
+        n=len(M)
+        code=ramsat.RED if color == 'red' else ramsat.BLUE
+        if codes is None:
+            codes=ramsat.pack_matrix(M)
+        found,examined=ramsat.find_monochromatic_clique(n,codes,k,code,matrix=M)
+        if self.tracer.enabled:
+            self.tracer.count("subsets_examined",examined,n=n,colour=color)
+            if found is not None:
+                self.tracer.count("clique_early_exits",n=n,colour=color)
+        return found
+    def has_monochromatic_clique(self,M,k,color):
+        """Check if the colouring contains a monochromatic clique of size k."""
+        return self.find_monochromatic_clique(M,k,color) is not None
+    def check_ramsey(self,n,k1,k2,trials):
+        """Monte Carlo estimation: check if R(k1,k2) <= n.
+
+        When every trial holds, ``self.last_witness`` is set to the colouring of
+        the final trial and the first monochromatic clique found in it.
+        Outcomes are shared through ``self.cache``, so trials another job has
+        already verified (or refuted) at this n are not repeated."""
+        tracer=self.tracer
+        traced=tracer.enabled
+        clock=time.perf_counter
+        a,b,swapped=(k1,k2,False) if k1 <= k2 else (k2,k1,True)
+        record=self.cache.record(n,a,b)
+        if record.failed_at is not None and record.failed_at < trials:
+            if traced:
+                tracer.count("trial_cache_hits",n=n)
+                tracer.count("trial_early_exits",n=n)
             return False
-        if k == 1:
+        if record.verified >= trials and record.witness is not None:
+            if traced:
+                tracer.count("trial_cache_hits",n=n)
+            self.last_witness=_swap_colours(record.witness) if swapped else record.witness
             return True
-        for subset in combinations(nodes,k):
-            sub=G.subgraph(subset)
-            edges=list(sub.edges())
-            if not edges and k <= 1:
-                continue
-            if len(edges) == k * (k - 1) // 2:
-                if all(G[u][v]['color'] == color for u,v in edges):
-                    return True
-        return False
-    def check_ramsey(self,n,k1,k2,trials):
-        """Monte Carlo estimation: check if R(k1,k2) <= n."""
-        for trial in range(trials):
+        # without a stored witness, re-run the final trial to rebuild one
+        first=min(record.verified,trials - 1)
+        M,clique,clique_color=None,None,None
+        witness=None
+        for trial in range(first,trials):
             if self.cancel_flag:
+                self.cache.update(record,verified=trial,witness=witness)
                 return False
-            G=nx.complete_graph(n)
-            for u,v in G.edges():
-                G[u][v]['color']=random.choice(['red','blue'])
-            has_red=self.has_monochromatic_clique(G,k1,'red')
-            has_blue=self.has_monochromatic_clique(G,k2,'blue')
-            if not has_red and not has_blue:
+            if traced:
+                t0=clock()
+            M,hit=self.cache.colouring(n,trial)
+            if traced:
+                t1=clock()
+            codes=ramsat.pack_matrix(M)
+            if traced:
+                t2=clock()
+            clique,clique_color=self.find_monochromatic_clique(M,a,'red',codes),'red'
+            if traced:
+                t3=clock()
+            if clique is None:
+                clique,clique_color=self.find_monochromatic_clique(M,b,'blue',codes),'blue'
+            if traced:
+                t4=clock()
+                tracer.add_time("colouring",t1 - t0,n=n)
+                tracer.add_time("graph_construction",t2 - t1,n=n)
+                tracer.add_time("red_clique_check",t3 - t2,n=n)
+                tracer.add_time("blue_clique_check",t4 - t3,n=n)
+                tracer.count("trials",n=n)
+                if hit:
+                    tracer.count("colouring_cache_hits",n=n)
+            if clique is None:
+                if traced:
+                    tracer.count("trial_early_exits",n=n)
+                self.cache.update(record,verified=trial,failed_at=trial,witness=witness)
                 return False
+            # kept so every advance of record.verified comes with a witness
+            witness=search_witness(n=n,colours=codes,clique=tuple(clique),clique_color=clique_color)
+        self.cache.update(record,verified=trials,witness=witness)
+        self.last_witness=_swap_colours(witness) if swapped else witness
         return True
     def estimate_ramsey(self,k1,k2,trials,max_n=50,progress_callback=None):
         """Estimate Ramsey number using binary search style approach."""
-        start_n=max(k1,k2)
-        for n in range(start_n,max_n + 1):
-            if self.cancel_flag:
-                return None,False
-            if progress_callback:
-                progress_callback(n,max_n)
-            if self.check_ramsey(n,k1,k2,trials):
-                return n,True
-        return None,False
+        tracer=self.tracer
+        tracer.begin_run(k1=k1,k2=k2,trials=trials,max_n=max_n)
+        self.last_witness=None
+        result,success=None,False
+        try:
+            with tracer.span("estimate_ramsey",k1=k1,k2=k2,trials=trials):
+                start_n=max(k1,k2)
+                for n in range(start_n,max_n + 1):
+                    if self.cancel_flag:
+                        break
+                    if progress_callback:
+                        with tracer.span("gui_callback",n=n):
+                            progress_callback(n,max_n)
+                    with tracer.span("check_ramsey",n=n):
+                        holds=self.check_ramsey(n,k1,k2,trials)
+                    if holds:
+                        result,success=n,True
+                        break
+        finally:
+            # also stops tracemalloc/cProfile when a check raises
+            tracer.end_run(result=result,success=success,cancelled=self.cancel_flag)
+        return result,success
     def get_graph_statistics(self,G):
         """Extract statistics from a graph."""
         red_edges=sum(1 for u,v,d in G.edges(data=True) if d.get('color') == 'red')
@@ -73,52 +218,305 @@ class ramsey_calculator:
             blue_edges=blue_edges,
             cliques_found={}
         )
+    def get_witness_statistics(self,witness):
+        """Extract statistics from a search witness without building a graph."""
+        edges=len(witness.colours)
+        red_edges=int(np.count_nonzero(witness.colours))
+        return graph_statistics(
+            vertices=witness.n,
+            edges=edges,
+            red_edges=red_edges,
+            blue_edges=edges - red_edges,
+            cliques_found={witness.clique_color:witness.clique}
+        )
+def pack_colouring(G):
+    """Return (n,codes) with one uint8 per edge of K_n in upper-triangle order (1=red,0=blue)."""
+    nodes=list(G.nodes)
+    n=len(nodes)
+    iu,ju=ramsat.edge_pairs(n)
+    codes=np.fromiter((G[nodes[i]][nodes[j]].get('color') == 'red' for i,j in zip(iu,ju)),
+                      dtype=np.uint8,count=len(iu))
+    return n,codes
+def _downsample(frac):
+    """Halve a red-fraction tile by averaging 2x2 blocks, ignoring NaN cells."""
+    h,w=frac.shape
+    padded=np.full((h + h % 2,w + w % 2),np.nan,dtype=np.float32)
+    padded[:h,:w]=frac
+    blocks=padded.reshape(padded.shape[0] // 2,2,padded.shape[1] // 2,2)
+    valid=~np.isnan(blocks)
+    counts=valid.sum(axis=(1,3))
+    sums=np.where(valid,blocks,0).sum(axis=(1,3))
+    out=np.full(counts.shape,np.nan,dtype=np.float32)
+    np.divide(sums,counts,out=out,where=counts > 0)
+    return out
 class graph_visualizer:
-    """Handles graph visualization."""
+    """Handles graph visualization.
+
+    One Figure/canvas is created on first use and reused for every result.
+    Layouts are cached per n and all edges live in a single LineCollection,
+    so a redraw only swaps segment and colour arrays.
+
+    The 'matrix' view draws the colouring as an adjacency heatmap instead.
+    A pyramid of 2x2-averaged tiles is built once per colouring and only the
+    visible window of the coarsest sufficient level is handed to imshow, so
+    zooming and panning stay interactive for n in the thousands."""
+    edge_colors=('#00d9ff','#ff4757')
+    max_labelled_n=40
+    max_graph_n=150
     def __init__(self,canvas_frame,bg_color="#0a0e27"):
         self.canvas_frame=canvas_frame
         self.bg_color=bg_color
         self.fig=None
         self.canvas=None
-    def create_static_visualization(self,G):
-        """Create static graph visualization."""
-        for widget in self.canvas_frame.winfo_children():
-            widget.destroy()
-        pos=nx.spring_layout(G,k=2.5,iterations=50,seed=42)
+        self.ax=None
+        self.edge_collection=None
+        self.clique_collection=None
+        self.node_collection=None
+        self.label_artists=[]
+        self.current_n=None
+        self.view_mode="graph"
+        self.reorder_by_degree=True
+        self.matrix_ax=None
+        self.matrix_image=None
+        self.matrix_highlight=None
+        self.matrix_levels=[]
+        self.matrix_n=0
+        self._last_colouring=None
+        self._pan_start=None
+        self._layouts={}
+        self._edge_rgba=np.array([to_rgba(c,alpha=0.8) for c in self.edge_colors])
+        self._matrix_cmap=LinearSegmentedColormap.from_list("ramsey",list(self.edge_colors))
+        self._matrix_cmap.set_bad(bg_color)
+    def circular_layout(self,n):
+        """Return cached node positions (n,2) and edge segments (E,2,2) for K_n."""
+        layout=self._layouts.get(n)
+        if layout is None:
+            pos=ramsat.circular_layout(n,start_angle=np.pi / 2)[:,:2]
+            iu,ju=ramsat.edge_pairs(n)
+            segments=np.stack((pos[iu],pos[ju]),axis=1)
+            layout=self._layouts[n]=(pos,segments)
+        return layout
+    def _ensure_figure(self):
+        """Create the persistent figure, axes and artists once."""
+        if self.fig is not None:
+            return
         self.fig=Figure(figsize=(8,6),dpi=100,facecolor=self.bg_color)
-        ax=self.fig.add_subplot(111,facecolor=self.bg_color)
-        red_edges=[(u,v) for u,v,d in G.edges(data=True) if d.get('color') == 'red']
-        blue_edges=[(u,v) for u,v,d in G.edges(data=True) if d.get('color') == 'blue']
-        nx.draw_networkx_edges(G,pos,edgelist=red_edges,
-                               edge_color='#ff4757',width=2.5,ax=ax,alpha=0.8)
-        nx.draw_networkx_edges(G,pos,edgelist=blue_edges,
-                               edge_color='#00d9ff',width=2.5,ax=ax,alpha=0.8)
-        nx.draw_networkx_nodes(G,pos,node_color='#1a2847',
-                               node_size=600,ax=ax,
-                               edgecolors='#00d9ff',linewidths=3)
-        nx.draw_networkx_labels(G,pos,font_size=11,
-                                font_color='#ffffff',
-                                font_weight='bold',ax=ax)
-        ax.axis('off')
+        self.ax=self.fig.add_subplot(111,facecolor=self.bg_color)
+        self.ax.set_xlim(-1.15,1.15)
+        self.ax.set_ylim(-1.15,1.15)
+        self.ax.set_aspect('equal')
+        self.ax.axis('off')
+        self.edge_collection=LineCollection([],linewidths=2.5,zorder=1)
+        self.ax.add_collection(self.edge_collection)
+        self.clique_collection=LineCollection([],colors='#ffd32a',linewidths=5,zorder=1.5)
+        self.ax.add_collection(self.clique_collection)
+        self.node_collection=self.ax.scatter([],[],s=600,c='#1a2847',
+                                             edgecolors='#00d9ff',linewidths=3,zorder=2)
         self.fig.tight_layout()
         self.canvas=FigureCanvasTkAgg(self.fig,master=self.canvas_frame)
-        self.canvas.draw()
         self.canvas.get_tk_widget().pack(fill="both",expand=True)
+        self.canvas.mpl_connect('scroll_event',self._on_scroll)
+        self.canvas.mpl_connect('button_press_event',self._on_press)
+        self.canvas.mpl_connect('button_release_event',self._on_release)
+        self.canvas.mpl_connect('motion_notify_event',self._on_motion)
+    def _ensure_matrix_axes(self):
+        """Create the heatmap axes and image the first time matrix view is used."""
+        if self.matrix_ax is not None:
+            return
+        self.matrix_ax=self.fig.add_axes(self.ax.get_position(),facecolor=self.bg_color)
+        self.matrix_ax.axis('off')
+        self.matrix_ax.set_autoscale_on(False)
+        self.matrix_image=self.matrix_ax.imshow(np.full((1,1),np.nan,dtype=np.float32),
+                                                cmap=self._matrix_cmap,vmin=0.0,vmax=1.0,
+                                                interpolation='nearest',origin='upper',
+                                                aspect='equal')
+        self.matrix_highlight=self.matrix_ax.scatter([],[],s=16,marker='s',facecolors='none',
+                                                     edgecolors='#ffd32a',linewidths=1.2,zorder=3)
+        self.matrix_ax.callbacks.connect('xlim_changed',self._refresh_matrix_tile)
+        self.matrix_ax.callbacks.connect('ylim_changed',self._refresh_matrix_tile)
+    def set_view_mode(self,mode):
+        """Switch between the 'graph' and 'matrix' views and redraw the last colouring."""
+        self.view_mode=mode
+        if self._last_colouring is not None:
+            self.draw_colouring(*self._last_colouring)
+    def _set_vertex_count(self,n):
+        """Swap geometry, marker sizes and labels when n changes."""
+        pos,segments=self.circular_layout(n)
+        scale=min(1.0,12 / n)
+        self.edge_collection.set_segments(segments)
+        self.edge_collection.set_linewidth(max(0.3,2.5 * scale))
+        self.node_collection.set_offsets(pos)
+        self.node_collection.set_sizes([max(20,600 * scale)])
+        self.node_collection.set_linewidths(max(0.5,3 * scale))
+        for label in self.label_artists:
+            label.remove()
+        self.label_artists=[]
+        if n <= self.max_labelled_n:
+            font_size=11 if n <= 12 else 7
+            self.label_artists=[
+                self.ax.text(x,y,str(i),ha='center',va='center',fontsize=font_size,
+                             color='#ffffff',fontweight='bold',zorder=3)
+                for i,(x,y) in enumerate(pos)
+            ]
+        self.current_n=n
+    def draw_colouring(self,n,codes,clique=None):
+        """Draw K_n from a packed colour array, updating edge colours in place."""
+        self._ensure_figure()
+        self._last_colouring=(n,codes,clique)
+        if self.view_mode == "matrix" or n > self.max_graph_n:
+            self._draw_matrix(n,codes,clique)
+        else:
+            if self.matrix_ax is not None:
+                self.matrix_ax.set_visible(False)
+            self.ax.set_visible(True)
+            if n != self.current_n:
+                self._set_vertex_count(n)
+            self.edge_collection.set_color(self._edge_rgba[np.asarray(codes,dtype=np.intp)])
+            self._highlight_clique(n,clique)
+        self.canvas.draw_idle()
         return self.fig
+    def _highlight_clique(self,n,clique):
+        """Outline the clique's edges and vertices in the node-link view."""
+        pos,_=self.circular_layout(n)
+        edge_colors=np.tile(to_rgba('#00d9ff'),(n,1))
+        if clique:
+            members=np.asarray(clique,dtype=np.intp)
+            a,b=np.triu_indices(len(members),k=1)
+            self.clique_collection.set_segments(np.stack((pos[members[a]],pos[members[b]]),axis=1))
+            edge_colors[members]=to_rgba('#ffd32a')
+        else:
+            self.clique_collection.set_segments([])
+        self.node_collection.set_edgecolors(edge_colors)
+    def _draw_matrix(self,n,codes,clique=None):
+        """Render the colouring as a heatmap, optionally sorted by red degree."""
+        self._ensure_matrix_axes()
+        self.ax.set_visible(False)
+        self.matrix_ax.set_visible(True)
+        M=ramsat.colour_matrix(n,codes)
+        if self.reorder_by_degree:
+            red_degree=(M == 1).sum(axis=1)
+            order=np.argsort(-red_degree,kind='stable')
+            M=M[order][:,order]
+            rank=np.empty(n,dtype=np.intp)
+            rank[order]=np.arange(n)
+        else:
+            rank=np.arange(n)
+        level0=M.astype(np.float32)
+        level0[M == 255]=np.nan
+        del M
+        self.matrix_levels=[level0]
+        while max(self.matrix_levels[-1].shape) > 64:
+            self.matrix_levels.append(_downsample(self.matrix_levels[-1]))
+        self.matrix_n=n
+        if clique:
+            cells=rank[np.asarray(clique,dtype=np.intp)]
+            xs,ys=np.meshgrid(cells,cells)
+            off_diagonal=xs != ys
+            self.matrix_highlight.set_offsets(np.column_stack((xs[off_diagonal],ys[off_diagonal])))
+        else:
+            self.matrix_highlight.set_offsets(np.empty((0,2)))
+        self.matrix_ax.set_xlim(-0.5,n - 0.5)
+        self.matrix_ax.set_ylim(n - 0.5,-0.5)
+        self._refresh_matrix_tile()
+    def _refresh_matrix_tile(self,ax=None):
+        """Show the visible window at the coarsest level that still fills the axes."""
+        if not self.matrix_levels:
+            return
+        n=self.matrix_n
+        x0,x1=sorted(self.matrix_ax.get_xlim())
+        y0,y1=sorted(self.matrix_ax.get_ylim())
+        pixels=max(1.0,min(self.matrix_ax.bbox.width,self.matrix_ax.bbox.height))
+        span=max(x1 - x0,y1 - y0)
+        level=int(np.clip(np.ceil(np.log2(max(span / pixels,1.0))),0,len(self.matrix_levels) - 1))
+        step=1 << level
+        data=self.matrix_levels[level]
+        c0=max(0,int(np.floor(x0 + 0.5)) // step)
+        c1=min(data.shape[1],int(np.ceil(x1 + 0.5)) // step + 1)
+        r0=max(0,int(np.floor(y0 + 0.5)) // step)
+        r1=min(data.shape[0],int(np.ceil(y1 + 0.5)) // step + 1)
+        if c1 <= c0 or r1 <= r0:
+            return
+        self.matrix_image.set_data(data[r0:r1,c0:c1])
+        self.matrix_image.set_extent((c0 * step - 0.5,min(c1 * step,n) - 0.5,
+                                      min(r1 * step,n) - 0.5,r0 * step - 0.5))
+    def _on_scroll(self,event):
+        """Zoom the heatmap around the cursor."""
+        if self.matrix_ax is None or event.inaxes is not self.matrix_ax:
+            return
+        factor=0.8 if event.button == 'up' else 1.25
+        n=self.matrix_n
+        def zoom(lo,hi,centre):
+            lo,hi=centre + (lo - centre) * factor,centre + (hi - centre) * factor
+            if hi - lo >= n:
+                return -0.5,n - 0.5
+            shift=max(0.0,-0.5 - lo) - max(0.0,hi - (n - 0.5))
+            return lo + shift,hi + shift
+        x0,x1=zoom(*self.matrix_ax.get_xlim(),event.xdata)
+        y1,y0=zoom(*sorted(self.matrix_ax.get_ylim()),event.ydata)
+        self.matrix_ax.set_xlim(x0,x1)
+        self.matrix_ax.set_ylim(y0,y1)
+        self.canvas.draw_idle()
+    def _on_press(self,event):
+        if self.matrix_ax is not None and event.inaxes is self.matrix_ax and event.button == 1:
+            self._pan_start=(event.x,event.y,self.matrix_ax.get_xlim(),self.matrix_ax.get_ylim())
+    def _on_release(self,event):
+        self._pan_start=None
+    def _on_motion(self,event):
+        """Pan the heatmap while the left button is held."""
+        if self._pan_start is None:
+            return
+        px,py,(x0,x1),(y0,y1)=self._pan_start
+        bbox=self.matrix_ax.bbox
+        dx=(event.x - px) * (x1 - x0) / bbox.width
+        dy=(event.y - py) * (y1 - y0) / bbox.height
+        self.matrix_ax.set_xlim(x0 - dx,x1 - dx)
+        self.matrix_ax.set_ylim(y0 - dy,y1 - dy)
+        self.canvas.draw_idle()
+    def create_static_visualization(self,G):
+        """Create static graph visualization."""
+        n,codes=pack_colouring(G)
+        return self.draw_colouring(n,codes)
+@dataclass
+class estimation_job:
+    """One queued, running or finished estimation shown as a job card."""
+    job_id: int
+    k1: int
+    k2: int
+    trials: int
+    max_n: int
+    calculator: ramsey_calculator
+    status: str="queued"
+    result: int=None
+    witness: search_witness=None
+    stats: graph_statistics=None
+    elapsed: float=0.0
+    future: object=None
+    widgets: dict=field(default_factory=dict)
+
 class ramsey_gui:
-    """Main GUI application for Ramsey Number Calculator."""
+    """Main GUI application for Ramsey Number Calculator.
+
+    Estimations run as jobs on a thread pool and share one estimation_cache.
+    Worker threads never touch Tk; they post events to a queue that the main
+    loop drains every 50 ms."""
     def __init__(self,root):
         self.root=root
         self.root.title("Ramsey Number Calculator")
         self.root.geometry("1700x900")
         self.root.configure(bg="#0a0e27")
-        self.calculator=ramsey_calculator()
+        self.cache=estimation_cache()
         self.visualizer=graph_visualizer(None)
-        self.current_graph=None
-        self.is_calculating=False
-        self.calculation_thread=None
+        self.current_witness=None
+        self.jobs={}
+        self.next_job_id=1
+        self.events=queue.Queue()
+        self.executor=ThreadPoolExecutor(max_workers=max(1,min(4,(os.cpu_count() or 2) - 1)),
+                                         thread_name_prefix="estimation")
+        self.trace_dir=os.environ.get("RAMSAT_TRACE_DIR")
         self.setup_styles()
         self.create_widgets()
+        self.root.protocol("WM_DELETE_WINDOW",self.on_close)
+        self.root.after(50,self._poll_events)
     def setup_styles(self):
         """Configure ttk styles for premium dark theme."""
         style=ttk.Style()
@@ -247,10 +645,27 @@ class ramsey_gui:
         graph_card.pack(fill="both",expand=True)
         graph_padding=ttk.Frame(graph_card,style="Card.TFrame")
         graph_padding.pack(fill="both",expand=True,padx=20,pady=20)
-        graph_title=tk.Label(graph_padding,text="Graph Visualization",
+        graph_header=tk.Frame(graph_padding,bg="#1a2847")
+        graph_header.pack(fill="x",pady=(0,15))
+        graph_title=tk.Label(graph_header,text="Graph Visualization",
                               bg="#1a2847",fg="#00d9ff",
                               font=("Segoe UI",14,"bold"))
-        graph_title.pack(anchor="w",pady=(0,15))
+        graph_title.pack(side="left")
+        self.view_mode_var=tk.StringVar(value="graph")
+        self.reorder_var=tk.BooleanVar(value=True)
+        tk.Checkbutton(graph_header,text="Sort by red degree",
+                        variable=self.reorder_var,
+                        command=self.on_view_change,
+                        bg="#1a2847",fg="#a0aaf0",selectcolor="#0a0e27",
+                        activebackground="#1a2847",
+                        font=("Segoe UI",9)).pack(side="right",padx=(10,0))
+        for text,value in (("Matrix","matrix"),("Graph","graph")):
+            tk.Radiobutton(graph_header,text=text,value=value,
+                            variable=self.view_mode_var,
+                            command=self.on_view_change,
+                            bg="#1a2847",fg="#a0aaf0",selectcolor="#0a0e27",
+                            activebackground="#1a2847",
+                            font=("Segoe UI",9)).pack(side="right")
         self.canvas_frame=ttk.Frame(graph_padding,style="Card.TFrame")
         self.canvas_frame.pack(fill="both",expand=True,pady=(0,15))
         self.visualizer.canvas_frame=self.canvas_frame
@@ -262,6 +677,19 @@ class ramsey_gui:
                                                  font=("Segoe UI",32,"bold"),
                                                  pady=15)
         self.result_value_label_graph.pack()
+        jobs_header=tk.Label(graph_padding,text="Jobs",
+                              bg="#1a2847",fg="#00d9ff",
+                              font=("Segoe UI",12,"bold"))
+        jobs_header.pack(anchor="w",pady=(10,5))
+        jobs_canvas=tk.Canvas(graph_padding,height=150,bg="#1a2847",highlightthickness=0)
+        jobs_scroll=ttk.Scrollbar(graph_padding,orient="horizontal",command=jobs_canvas.xview)
+        jobs_canvas.configure(xscrollcommand=jobs_scroll.set)
+        jobs_canvas.pack(fill="x")
+        jobs_scroll.pack(fill="x")
+        self.jobs_frame=tk.Frame(jobs_canvas,bg="#1a2847")
+        jobs_canvas.create_window((0,0),window=self.jobs_frame,anchor="nw")
+        self.jobs_frame.bind("<Configure>",
+                             lambda e: jobs_canvas.configure(scrollregion=jobs_canvas.bbox("all")))
     def show_input_section(self):
         """Switch to input section."""
         self.results_section.pack_forget()
@@ -270,11 +698,12 @@ class ramsey_gui:
         """Switch to results section."""
         self.input_section.pack_forget()
         self.results_section.pack(fill="both",expand=True)
+    def on_view_change(self):
+        """Switch the visualizer between node-link and heatmap views."""
+        self.visualizer.reorder_by_degree=self.reorder_var.get()
+        self.visualizer.set_view_mode(self.view_mode_var.get())
     def on_calculate(self):
-        """Handle calculation start."""
-        if self.is_calculating:
-            messagebox.showwarning("Warning","Calculation already in progress!")
-            return
+        """Validate the inputs and queue a new estimation job."""
         try:
             k1=int(self.entry_k1.get())
             k2=int(self.entry_k2.get())
@@ -289,54 +718,156 @@ class ramsey_gui:
             if max_n < max(k1,k2) or max_n > 100:
                 messagebox.showerror("Error",f"Max n must be {max(k1,k2)}-100!")
                 return
-            self.is_calculating=True
-            self.btn_calculate.config(state="disabled")
-            self.status_label.config(text="● Computing...",fg="#ffaa00")
-            self.status_detail.config(text="Please wait...")
-            self.result_value_label_graph.config(text="Computing...",fg="#ffaa00")
-            self.calculation_thread=threading.Thread(
-                target=self._calculate_thread,
-                args=(k1,k2,trials,max_n),
-                daemon=True
-            )
-            self.calculation_thread.start()
+            self.submit_job(k1,k2,trials,max_n)
         except ValueError:
             messagebox.showerror("Error","Please enter valid integers!")
-    def _calculate_thread(self,k1,k2,trials,max_n):
-        """Run calculation in background thread."""
+    def submit_job(self,k1,k2,trials,max_n):
+        """Create a job card and hand the job to the worker pool."""
+        job=estimation_job(job_id=self.next_job_id,k1=k1,k2=k2,trials=trials,max_n=max_n,
+                           calculator=ramsey_calculator(cache=self.cache))
+        self.next_job_id+=1
+        self.jobs[job.job_id]=job
+        self._create_job_card(job)
+        job.future=self.executor.submit(self._run_job,job)
+        self._refresh_status()
+        return job
+    def _create_job_card(self,job):
+        """Build the progress bar, cancel control and result area for a job."""
+        card=tk.Frame(self.jobs_frame,bg="#0a0e27",padx=10,pady=8)
+        card.pack(side="left",fill="y",padx=(0,10))
+        tk.Label(card,text=f"R({job.k1},{job.k2})  ·  {job.trials} trials  ·  n≤{job.max_n}",
+                 bg="#0a0e27",fg="#a0aaf0",font=("Segoe UI",9)).pack(anchor="w")
+        progress=ttk.Progressbar(card,orient="horizontal",length=200,
+                                 mode="determinate",maximum=100)
+        progress.pack(fill="x",pady=(6,4))
+        status=tk.Label(card,text="Queued",bg="#0a0e27",fg="#ffaa00",
+                        font=("Segoe UI",9))
+        status.pack(anchor="w")
+        result=tk.Label(card,text="…",bg="#0a0e27",fg="#888888",
+                        font=("Segoe UI",16,"bold"))
+        result.pack(anchor="w")
+        buttons=tk.Frame(card,bg="#0a0e27")
+        buttons.pack(fill="x",pady=(4,0))
+        button_style=dict(bg="#1a2847",fg="#00d9ff",font=("Segoe UI",9,"bold"),
+                          relief="flat",bd=0,padx=10,pady=3,cursor="hand2",
+                          activebackground="#00d9ff",activeforeground="#0a0e27")
+        cancel=tk.Button(buttons,text="Cancel",command=lambda: self.cancel_job(job),**button_style)
+        cancel.pack(side="left")
+        view=tk.Button(buttons,text="View",state="disabled",
+                       command=lambda: self.show_job(job),**button_style)
+        view.pack(side="left",padx=(6,0))
+        job.widgets=dict(card=card,progress=progress,status=status,result=result,
+                         cancel=cancel,view=view)
+    def _run_job(self,job):
+        """Worker-thread body: run one estimation and post events for the GUI."""
+        if job.calculator.cancel_flag:
+            self.events.put((job.job_id,"finished",None))
+            return
+        self.events.put((job.job_id,"started",None))
         start_time=time.time()
+        start_n=max(job.k1,job.k2)
         def progress_callback(n,max_n):
-            elapsed=time.time() - start_time
-            progress_percent=int((n / max_n) * 100)
-            self.status_detail.config(text=f"Testing n={n}/{max_n} ({progress_percent}%)")
-            self.root.update()
-        result,success=self.calculator.estimate_ramsey(k1,k2,trials,
-                                                          max_n,
-                                                          progress_callback)
-        elapsed=time.time() - start_time
-        if success:
-            G=nx.complete_graph(result)
-            for u,v in G.edges():
-                G[u][v]['color']=random.choice(['red','blue'])
-            self.current_graph=G
-            stats=self.calculator.get_graph_statistics(G)
-            self.root.after(100,lambda: self.update_displays(k1,k2,result,stats,elapsed))
-            self.status_label.config(text="● Complete",fg="#00ff99")
-            self.status_detail.config(text=f"R({k1},{k2})={result}")
-        else:
-            self.result_value_label_graph.config(
-                text=f"R({k1},{k2}) > {max_n}",
-                fg="#ff6b6b",
-                font=("Segoe UI",28,"bold")
+            self.events.put((job.job_id,"progress",(n,(n - start_n) / (max_n - start_n + 1))))
+        calculator=job.calculator
+        if self.trace_dir:
+            calculator.tracer=run_tracer(
+                profile=os.environ.get("RAMSAT_PROFILE") == "1",
+                trace_memory=os.environ.get("RAMSAT_TRACEMALLOC") == "1"
             )
-            self.status_label.config(text="● Incomplete",fg="#ff6b6b")
-            self.status_detail.config(text=f"Tested up to n={max_n}")
-        self.is_calculating=False
-        self.btn_calculate.config(state="normal")
-        self.calculator.cancel_flag=False
+        try:
+            result,success=calculator.estimate_ramsey(job.k1,job.k2,job.trials,
+                                                      job.max_n,
+                                                      progress_callback)
+            if success:
+                job.result=result
+                job.witness=calculator.last_witness
+                job.stats=calculator.get_witness_statistics(job.witness)
+            job.elapsed=time.time() - start_time
+            if self.trace_dir:
+                os.makedirs(self.trace_dir,exist_ok=True)
+                prefix=os.path.join(self.trace_dir,f"estimate_R{job.k1}_{job.k2}_job{job.job_id}_{int(start_time)}")
+                calculator.tracer.export(prefix)
+        except Exception as e:
+            self.events.put((job.job_id,"error",str(e)))
+            return
+        finally:
+            if self.trace_dir:
+                calculator.tracer=null_tracer()
+        self.events.put((job.job_id,"finished",success))
+    def _poll_events(self):
+        """Apply worker events to job cards on the Tk thread."""
+        try:
+            while True:
+                job_id,kind,payload=self.events.get_nowait()
+                job=self.jobs.get(job_id)
+                if job is not None:
+                    self._apply_job_event(job,kind,payload)
+        except queue.Empty:
+            pass
+        self.root.after(50,self._poll_events)
+    def _apply_job_event(self,job,kind,payload):
+        w=job.widgets
+        if kind == "started":
+            job.status="running"
+            w["status"].config(text="Starting...",fg="#ffaa00")
+        elif kind == "progress":
+            n,fraction=payload
+            w["progress"].config(value=fraction * 100)
+            w["status"].config(text=f"Testing n={n}/{job.max_n}")
+        elif kind == "error":
+            job.status="failed"
+            w["status"].config(text=f"Error: {payload}",fg="#ff6b6b")
+            w["cancel"].config(state="disabled")
+        elif kind == "finished":
+            w["cancel"].config(state="disabled")
+            if job.calculator.cancel_flag:
+                job.status="cancelled"
+                w["status"].config(text="Cancelled",fg="#ff6b6b")
+            elif payload:
+                job.status="complete"
+                w["progress"].config(value=100)
+                w["status"].config(text=f"Complete in {job.elapsed:.2f}s",fg="#00ff99")
+                w["result"].config(text=f"R({job.k1},{job.k2})={job.result}",fg="#00ff99")
+                w["view"].config(state="normal")
+                self.show_job(job)
+            else:
+                job.status="incomplete"
+                w["progress"].config(value=100)
+                w["status"].config(text=f"Tested up to n={job.max_n}",fg="#ff6b6b")
+                w["result"].config(text=f"R({job.k1},{job.k2}) > {job.max_n}",fg="#ff6b6b")
+        self._refresh_status()
+    def cancel_job(self,job):
+        """Cancel a queued job outright or ask a running one to stop."""
+        job.calculator.cancel_flag=True
+        if job.future is not None and job.future.cancel():
+            self._apply_job_event(job,"finished",None)
+        else:
+            job.widgets["status"].config(text="Cancelling...",fg="#ffaa00")
+    def show_job(self,job):
+        """Show a finished job's witness and statistics."""
+        if job.witness is None:
+            return
+        self.current_witness=job.witness
+        self.update_displays(job.k1,job.k2,job.result,job.stats,job.elapsed)
+    def _refresh_status(self):
+        running=sum(1 for job in self.jobs.values() if job.status == "running")
+        queued=sum(1 for job in self.jobs.values() if job.status == "queued" and not job.calculator.cancel_flag)
+        if running or queued:
+            self.status_label.config(text="● Computing...",fg="#ffaa00")
+            self.status_detail.config(text=f"{running} running · {queued} queued")
+        else:
+            self.status_label.config(text="● Ready",fg="#00ff99")
+            self.status_detail.config(text=f"{len(self.jobs)} job(s) finished")
+    def on_close(self):
+        """Stop every job and close the window."""
+        for job in self.jobs.values():
+            job.calculator.cancel_flag=True
+        self.executor.shutdown(wait=False,cancel_futures=True)
+        self.root.destroy()
     def update_displays(self,k1,k2,result,stats,elapsed):
         """Update both left and right panel displays."""
-        self.visualizer.create_static_visualization(self.current_graph)
+        witness=self.current_witness
+        self.visualizer.draw_colouring(witness.n,witness.colours,witness.clique)
         self.result_value_label_graph.config(
             text=f"R({k1},{k2})={result}",
             fg="#00ff99",
@@ -355,6 +886,9 @@ class ramsey_gui:
             ("Computation Time",f"{elapsed:.2f}s"),
             ("Graph Density",f"{2*stats.edges/(stats.vertices*(stats.vertices-1)):.4f}")
         ]
+        for color,clique in stats.cliques_found.items():
+            stats_items.append((f"{color.title()} K{len(clique)} Witness",
+                                ",".join(str(v) for v in clique)))
         for label_text,value_text in stats_items:
             item_frame=tk.Frame(self.stats_container,bg="#1a2847")
             item_frame.pack(fill="x",pady=5)
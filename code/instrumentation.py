@@ -0,0 +1,207 @@
+import json
+import time
+import threading
+from collections import defaultdict
+
+class _null_span:
+    """Context manager that does nothing (shared by the null tracer)."""
+    def __enter__(self):
+        return self
+    def __exit__(self,exc_type,exc,tb):
+        return False
+
+_NULL_SPAN=_null_span()
+
+# cProfile and tracemalloc are process-wide, so runs using them take turns
+_PROCESS_HOOKS_LOCK=threading.Lock()
+
+class null_tracer:
+    """Tracer used when instrumentation is switched off.
+
+    Hot loops check ``tracer.enabled`` before touching the clock or the
+    counters, so a disabled run pays for one attribute lookup per phase."""
+    enabled=False
+    def begin_run(self,**params):
+        pass
+    def end_run(self,**result):
+        pass
+    def span(self,name,**args):
+        return _NULL_SPAN
+    def count(self,name,value=1,**labels):
+        pass
+    def add_time(self,phase,seconds,**labels):
+        pass
+
+class _span:
+    """Timing span recorded as a Chrome trace 'complete' event."""
+    def __init__(self,tracer,name,args):
+        self.tracer=tracer
+        self.name=name
+        self.args=args
+        self.start=0.0
+    def __enter__(self):
+        self.start=time.perf_counter()
+        return self
+    def __exit__(self,exc_type,exc,tb):
+        end=time.perf_counter()
+        self.tracer._record_span(self.name,self.start,end,self.args)
+        self.tracer.add_time(self.name,end - self.start,**self.args)
+        return False
+
+class run_tracer:
+    """Collect counters, phase timings and optional profiles for one estimation run.
+
+    Counters and phase timings are keyed by name plus a sorted tuple of label
+    pairs (for example ``n`` and ``colour``) so they map directly onto
+    Prometheus series. Spans are kept as Chrome trace events and can be
+    loaded into chrome://tracing or Perfetto."""
+    enabled=True
+    def __init__(self,profile=False,trace_memory=False,max_events=100000):
+        self.profile=profile
+        self.trace_memory=trace_memory
+        self.max_events=max_events
+        self.counters=defaultdict(int)
+        self.timings=defaultdict(lambda: [0,0.0,0.0])
+        self.events=[]
+        self.dropped_events=0
+        self.params={}
+        self.result={}
+        self.profile_stats=None
+        self.memory_stats=None
+        self._profiler=None
+        self._holds_hooks=False
+        self._origin=time.perf_counter()
+        self._lock=threading.Lock()
+    def begin_run(self,**params):
+        """Start a run, switching on cProfile/tracemalloc if requested.
+
+        Runs that profile or trace memory wait here until any other such
+        run in the process has ended."""
+        self.params=params
+        if (self.profile or self.trace_memory) and not self._holds_hooks:
+            _PROCESS_HOOKS_LOCK.acquire()
+            self._holds_hooks=True
+        self._origin=time.perf_counter()
+        if self.trace_memory:
+            import tracemalloc
+            tracemalloc.start()
+        if self.profile:
+            import cProfile
+            self._profiler=cProfile.Profile()
+            self._profiler.enable()
+    def end_run(self,**result):
+        """Finish a run and collect profiler and allocation snapshots."""
+        self.result=result
+        try:
+            self._collect_hooks()
+        finally:
+            if self._holds_hooks:
+                self._holds_hooks=False
+                _PROCESS_HOOKS_LOCK.release()
+    def _collect_hooks(self):
+        if self._profiler is not None:
+            import io
+            import pstats
+            self._profiler.disable()
+            out=io.StringIO()
+            stats=pstats.Stats(self._profiler,stream=out)
+            stats.sort_stats("cumulative").print_stats(30)
+            self.profile_stats=out.getvalue()
+            self._profiler=None
+        if self.trace_memory:
+            import tracemalloc
+            if tracemalloc.is_tracing():
+                current,peak=tracemalloc.get_traced_memory()
+                snapshot=tracemalloc.take_snapshot()
+                tracemalloc.stop()
+                self.memory_stats={
+                    "current_bytes":current,
+                    "peak_bytes":peak,
+                    "top":[str(stat) for stat in snapshot.statistics("lineno")[:15]]
+                }
+    def span(self,name,**args):
+        """Return a context manager timing one phase."""
+        return _span(self,name,args)
+    def count(self,name,value=1,**labels):
+        """Increment a counter series (numpy integers are stored as int)."""
+        key=(name,tuple(sorted(labels.items())))
+        with self._lock:
+            self.counters[key]+=int(value)
+    def add_time(self,phase,seconds,**labels):
+        """Accumulate time spent in a phase (count, total, max)."""
+        key=(phase,tuple(sorted(labels.items())))
+        with self._lock:
+            entry=self.timings[key]
+            entry[0]+=1
+            entry[1]+=seconds
+            if seconds > entry[2]:
+                entry[2]=seconds
+    def _record_span(self,name,start,end,args):
+        with self._lock:
+            if len(self.events) >= self.max_events:
+                self.dropped_events+=1
+                return
+            self.events.append({
+                "name":name,
+                "ph":"X",
+                "ts":(start - self._origin) * 1e6,
+                "dur":(end - start) * 1e6,
+                "pid":1,
+                "tid":threading.get_ident(),
+                "args":{k:str(v) for k,v in args.items()}
+            })
+    def to_json(self):
+        """Return the run as a Chrome trace JSON document with extra metadata."""
+        def series(table,value):
+            return [dict(name=name,labels=dict(labels),**value(v))
+                    for (name,labels),v in sorted(table.items(),key=lambda kv: (kv[0][0],str(kv[0][1])))]
+        doc={
+            "traceEvents":self.events,
+            "displayTimeUnit":"ms",
+            "metadata":{
+                "params":self.params,
+                "result":{k:str(v) for k,v in self.result.items()},
+                "dropped_events":self.dropped_events,
+                "counters":series(self.counters,lambda v: {"value":v}),
+                "timings":series(self.timings,lambda v: {"count":v[0],"total_s":v[1],"max_s":v[2]}),
+                "profile":self.profile_stats,
+                "memory":self.memory_stats
+            }
+        }
+        return json.dumps(doc,indent=1)
+    def to_prometheus(self,prefix="ramsey"):
+        """Return counters and timings in the Prometheus text exposition format."""
+        def fmt_labels(labels):
+            if not labels:
+                return ""
+            return "{" + ",".join(f'{k}="{v}"' for k,v in labels) + "}"
+        lines=[]
+        seen=set()
+        for (name,labels),value in sorted(self.counters.items(),key=lambda kv: (kv[0][0],str(kv[0][1]))):
+            metric=f"{prefix}_{name}_total"
+            if metric not in seen:
+                lines.append(f"# TYPE {metric} counter")
+                seen.add(metric)
+            lines.append(f"{metric}{fmt_labels(labels)} {value}")
+        timings=sorted(self.timings.items(),key=lambda kv: (kv[0][0],str(kv[0][1])))
+        if timings:
+            lines.append(f"# TYPE {prefix}_phase_seconds summary")
+            for (phase,labels),(count,total,peak) in timings:
+                all_labels=(("phase",phase),) + labels
+                lines.append(f"{prefix}_phase_seconds_count{fmt_labels(all_labels)} {count}")
+                lines.append(f"{prefix}_phase_seconds_sum{fmt_labels(all_labels)} {total:.9f}")
+            lines.append(f"# TYPE {prefix}_phase_max_seconds gauge")
+            for (phase,labels),(count,total,peak) in timings:
+                all_labels=(("phase",phase),) + labels
+                lines.append(f"{prefix}_phase_max_seconds{fmt_labels(all_labels)} {peak:.9f}")
+        if self.memory_stats:
+            lines.append(f"# TYPE {prefix}_peak_memory_bytes gauge")
+            lines.append(f"{prefix}_peak_memory_bytes {self.memory_stats['peak_bytes']}")
+        return "\n".join(lines) + "\n"
+    def export(self,path_prefix):
+        """Write ``<prefix>.json`` (trace) and ``<prefix>.prom`` (snapshot)."""
+        with open(path_prefix + ".json","w",encoding="utf-8") as f:
+            f.write(self.to_json())
+        with open(path_prefix + ".prom","w",encoding="utf-8") as f:
+            f.write(self.to_prometheus())
+        return path_prefix + ".json",path_prefix + ".prom"
@@ -1,101 +1,1407 @@
+import ast
+import hashlib
+import json
 import os
+import shutil
+import signal
 import subprocess
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Rough peak RSS of one manim render (Cairo frames + ffmpeg pipe), used to
+# cap parallel renders by available memory.
+RENDER_MEMORY_ESTIMATE = {
+    "low": 600 * 2**20,
+    "medium": 900 * 2**20,
+    "high": 1500 * 2**20,
+    "production": 3 * 2**30,
+}
+
+# Folder manim writes each quality's movies to, under media/videos/<scene file>/
+QUALITY_DIRS = {
+    "low": "480p15",
+    "medium": "720p30",
+    "high": "1080p60",
+    "production": "2160p60",
+}
+
+
+def quality_size(quality):
+    """(height, fps) of a quality tier, e.g. 'medium' -> (720, 30)"""
+    height, fps = QUALITY_DIRS[quality].split("p")
+    return int(height), int(fps)
+
+
+def manim_version():
+    """Return the installed manim version (part of every build hash)"""
+    try:
+        from importlib.metadata import version
+        return version("manim")
+    except Exception:
+        return "unknown"
+
+
+def local_imports(filepath, search_dirs):
+    """Return files of modules imported by filepath that live in search_dirs"""
+    try:
+        with open(filepath, encoding="utf-8") as f:
+            tree = ast.parse(f.read(), filename=filepath)
+    except (OSError, SyntaxError):
+        return []
+    modules = set()
+    relative = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            modules.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+            modules.add(node.module)
+            modules.update(f"{node.module}.{alias.name}" for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            # "from .x import y" inside a package resolves from this file's folder
+            base = os.path.dirname(filepath)
+            for _ in range(node.level - 1):
+                base = os.path.dirname(base)
+            prefix = node.module.split(".") if node.module else []
+            relative.add((base, tuple(prefix)))
+            relative.update((base, tuple(prefix + [alias.name])) for alias in node.names)
+    found = []
+    for base, parts in sorted(relative):
+        path = os.path.join(base, *parts)
+        for candidate in (path + ".py", os.path.join(path, "__init__.py")):
+            if parts and os.path.isfile(candidate):
+                found.append(os.path.normpath(candidate))
+    for module in sorted(modules):
+        parts = module.split(".")
+        for directory in search_dirs:
+            base = os.path.join(directory, *parts)
+            for candidate in (base + ".py", os.path.join(base, "__init__.py")):
+                if os.path.isfile(candidate):
+                    found.append(os.path.normpath(candidate))
+    return found
+
+# manim base classes a renderable scene can derive from
+SCENE_BASES = {
+    "Scene", "ThreeDScene", "MovingCameraScene", "ZoomedScene",
+    "VectorScene", "LinearTransformationScene", "SpecialThreeDScene",
+}
+
+
+def parse_scene_classes(filepath):
+    """Return every class in a file with its base names, without importing it"""
+    with open(filepath, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=filepath)
+    classes = []
+    for node in tree.body:
+        if not isinstance(node, ast.ClassDef):
+            continue
+        bases = []
+        for base in node.bases:
+            if isinstance(base, ast.Name):
+                bases.append(base.id)
+            elif isinstance(base, ast.Attribute):
+                bases.append(base.attr)
+        has_construct = any(isinstance(item, ast.FunctionDef) and item.name == "construct"
+                            for item in node.body)
+        classes.append({
+            "name": node.name,
+            "bases": bases,
+            "has_construct": has_construct,
+            "lineno": node.lineno,
+        })
+    return classes
+
+# mobjects whose SVGs manim caches under media/Tex and media/texts
+TEXT_MOBJECTS = {"Tex", "MathTex", "Text", "MarkupText"}
+LATEX_MOBJECTS = {"Tex", "MathTex"}
+# mobject_cache wrappers, which collect_text_calls never reads
+LATEX_HELPERS = {"tex", "math_tex"}
+# index entries for Tex gathered by running a scene rather than read from source
+SCENE_RUN_PREFIX = "scene:"
+
+# Size cap for the shared Tex/Text cache (override with RAMSAT_TEX_CACHE_MB)
+TEX_CACHE_MB = 512
+
+
+def _is_static(node):
+    """True for expressions built only from literals and UPPER_CASE manim constants"""
+    if isinstance(node, ast.Constant):
+        return True
+    if isinstance(node, ast.Name):
+        return node.id.isupper()
+    if isinstance(node, ast.UnaryOp):
+        return _is_static(node.operand)
+    if isinstance(node, ast.BinOp):
+        return _is_static(node.left) and _is_static(node.right)
+    if isinstance(node, (ast.Tuple, ast.List)):
+        return all(_is_static(item) for item in node.elts)
+    if isinstance(node, ast.Dict):
+        return all(key is not None and _is_static(key) for key in node.keys) and \
+            all(_is_static(value) for value in node.values)
+    return False
+
+
+def collect_text_calls(filepath):
+    """Return the source of every Tex/MathTex/Text call whose arguments are all literals
+
+    Calls built from loop variables (e.g. Tex(str(i+1))) can't be known
+    without running the scene; see has_computed_tex_calls.
+    """
+    try:
+        with open(filepath, encoding="utf-8") as f:
+            tree = ast.parse(f.read(), filename=filepath)
+    except (OSError, SyntaxError):
+        return []
+    calls = set()
+    for node in ast.walk(tree):
+        if not (isinstance(node, ast.Call) and isinstance(node.func, ast.Name)
+                and node.func.id in TEXT_MOBJECTS and node.args):
+            continue
+        if any(kw.arg is None for kw in node.keywords):
+            continue
+        if all(_is_static(arg) for arg in node.args + [kw.value for kw in node.keywords]):
+            calls.add(ast.unparse(node))
+    return sorted(calls)
+
+
+def has_computed_tex_calls(filepath):
+    """True if a Tex/MathTex call has an argument that collect_text_calls can't read
+
+    Calls through the mobject_cache helpers always count.
+    """
+    try:
+        with open(filepath, encoding="utf-8") as f:
+            tree = ast.parse(f.read(), filename=filepath)
+    except (OSError, SyntaxError):
+        return False
+    for node in ast.walk(tree):
+        if not (isinstance(node, ast.Call) and isinstance(node.func, ast.Name)):
+            continue
+        if node.func.id in LATEX_HELPERS:
+            return True
+        if node.func.id in LATEX_MOBJECTS:
+            if any(kw.arg is None for kw in node.keywords) or \
+                    not all(_is_static(arg) for arg in node.args + [kw.value for kw in node.keywords]):
+                return True
+    return False
+
+
+def scene_run_call(filepath, class_name, source_hash):
+    """Index entry for the Tex fragments found by running a scene with animations skipped
+
+    The source hash is part of the entry, so an edited scene is run again
+    while an unchanged one is looked up like any literal call.
+    """
+    return f"{SCENE_RUN_PREFIX}{filepath}:{class_name}:{source_hash[:16]}"
+
+
+def available_memory():
+    """Return available RAM in bytes, or None if it cannot be determined"""
+    try:
+        import psutil
+        return psutil.virtual_memory().available
+    except ImportError:
+        pass
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+class TexCache:
+    """Shared manim Tex/Text SVG cache with parallel pre-warming and LRU eviction
+
+    The index maps each literal Tex/Text call to the cache files it uses
+    and when a scene last needed them, which drives eviction.
+    """
+    
+    SUBDIRS = ("Tex", "texts")
+    INTERMEDIATE = (".aux", ".log", ".dvi", ".xdv")
+    
+    def __init__(self, media_dir, index_file, hooks_script, max_bytes=None):
+        self.media_dir = media_dir
+        self.index_file = index_file
+        self.hooks_script = hooks_script
+        if max_bytes is None:
+            max_bytes = int(os.environ.get("RAMSAT_TEX_CACHE_MB", TEX_CACHE_MB)) * 2**20
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+    
+    def _load(self):
+        try:
+            with open(self.index_file) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    def _save(self, index):
+        os.makedirs(os.path.dirname(self.index_file), exist_ok=True)
+        with open(self.index_file, "w") as f:
+            json.dump(index, f, indent=1, sort_keys=True)
+    
+    def cache_files(self):
+        """Return {path: (size, mtime)} for every file in the shared cache"""
+        files = {}
+        for subdir in self.SUBDIRS:
+            directory = os.path.join(self.media_dir, subdir)
+            if not os.path.isdir(directory):
+                continue
+            for filename in os.listdir(directory):
+                path = os.path.join(directory, filename)
+                stat = os.stat(path)
+                files[os.path.normpath(path)] = (stat.st_size, stat.st_mtime)
+        return files
+    
+    def missing(self, calls):
+        """Calls that were never compiled or whose SVGs have since been removed"""
+        index = self._load()
+        return [call for call in calls
+                if call not in index
+                or not (index[call]["files"] or call.startswith(SCENE_RUN_PREFIX))
+                or not all(os.path.exists(path) for path in index[call]["files"])]
+    
+    def _run_worker(self, calls, job_path):
+        with open(job_path, "w") as f:
+            json.dump({"media_dir": self.media_dir, "calls": calls}, f)
+        try:
+            proc = subprocess.run([sys.executable, self.hooks_script, "prewarm", job_path],
+                                  capture_output=True, text=True)
+        finally:
+            os.remove(job_path)
+        if proc.returncode != 0:
+            return [{"source": call, "files": [], "error": proc.stderr.strip().splitlines()[-1:]}
+                    for call in calls]
+        return json.loads(proc.stdout.strip().splitlines()[-1])["results"]
+    
+    def prewarm(self, calls, workers=None):
+        """Compile the missing calls across worker processes; return (compiled, failed)"""
+        with self._lock:
+            todo = self.missing(calls)
+            if todo:
+                # All LaTeX fragments go to one worker, which compiles them as a
+                # single multi-page document; Text (Pango) calls are spread out
+                tex = [call for call in todo if call.startswith(SCENE_RUN_PREFIX)
+                       or call.split("(", 1)[0] in LATEX_MOBJECTS]
+                text = [call for call in todo if call not in tex]
+                workers = workers or os.cpu_count() or 1
+                workers = max(1, min(workers - 1 if tex else workers, len(text)))
+                batches = [batch for batch in [tex] + [text[i::workers] for i in range(workers)] if batch]
+                workers = len(batches)
+                job_dir = os.path.dirname(self.index_file)
+                os.makedirs(job_dir, exist_ok=True)
+                with ThreadPoolExecutor(max_workers=workers) as pool:
+                    futures = [pool.submit(self._run_worker, batch,
+                                           os.path.join(job_dir, f"prewarm_{os.getpid()}_{i}.json"))
+                               for i, batch in enumerate(batches)]
+                    results = [result for future in futures for result in future.result()]
+            else:
+                results = []
+            
+            index = self._load()
+            now = time.time()
+            failed = []
+            for result in results:
+                if result.get("error"):
+                    failed.append(result)
+                    continue
+                index[result["source"]] = {
+                    "files": [os.path.normpath(os.path.relpath(path)) for path in result["files"]],
+                }
+            for call in calls:
+                if call in index:
+                    index[call]["used"] = now
+            self._save(index)
+            return len(results) - len(failed), failed
+    
+    def evict(self, protect=()):
+        """Delete least recently used files until the cache fits under max_bytes"""
+        with self._lock:
+            index = self._load()
+            files = self.cache_files()
+            total = sum(size for size, _ in files.values())
+            if total <= self.max_bytes:
+                return 0, total
+            
+            keep = set()
+            last_used = {}
+            for call, entry in index.items():
+                for path in entry["files"]:
+                    last_used[path] = max(last_used.get(path, 0), entry.get("used", 0))
+                    if call in protect:
+                        keep.add(path)
+            
+            def group(path):
+                # an SVG and the .tex it was compiled from go together
+                return os.path.splitext(path)[0]
+            
+            groups = {}
+            for path, (size, mtime) in files.items():
+                entry = groups.setdefault(group(path), [0, 0.0, []])
+                entry[0] += size
+                entry[1] = max(entry[1], last_used.get(path, mtime))
+                entry[2].append(path)
+            
+            removed = 0
+            for stem, (size, used, paths) in sorted(groups.items(), key=lambda kv: kv[1][1]):
+                if total <= self.max_bytes:
+                    break
+                if any(path in keep for path in paths):
+                    continue
+                for path in paths:
+                    os.remove(path)
+                total -= size
+                removed += len(paths)
+            
+            for call in list(index):
+                if not all(os.path.exists(path) for path in index[call]["files"]):
+                    del index[call]
+            self._save(index)
+            return removed, total
+    
+    def clean_orphans(self, known_calls):
+        """Drop index entries no scene uses any more, plus leftover LaTeX intermediates"""
+        with self._lock:
+            index = self._load()
+            known = set(known_calls)
+            stale = [call for call in index if call not in known]
+            still_used = {path for call, entry in index.items() if call in known
+                          for path in entry["files"]}
+            removed = 0
+            for call in stale:
+                for path in index.pop(call)["files"]:
+                    if path in still_used:
+                        continue
+                    for candidate in (path, os.path.splitext(path)[0] + ".tex"):
+                        if os.path.exists(candidate):
+                            os.remove(candidate)
+                            removed += 1
+            for path in self.cache_files():
+                stem, ext = os.path.splitext(path)
+                # LaTeX leftovers, and .tex sources whose compile never produced an SVG
+                if ext in self.INTERMEDIATE or (ext == ".tex" and not os.path.exists(stem + ".svg")):
+                    os.remove(path)
+                    removed += 1
+            self._save(index)
+            return removed
+    
+    def link_into(self, media_dir):
+        """Hard-link the shared cache into another media folder (copy if linking fails)"""
+        for path in self.cache_files():
+            target = os.path.join(media_dir, os.path.relpath(path, self.media_dir))
+            if os.path.exists(target):
+                continue
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            try:
+                os.link(path, target)
+            except OSError:
+                shutil.copy2(path, target)
+
+
+class WatchWorker:
+    """Background thread for watch mode that runs only the newest job
+    
+    Each job is a list of (label, command, log path). Submitting a job
+    while another runs kills the running command (its whole process
+    group, so manim's ffmpeg goes too) and skips the rest of that job.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._generation = 0
+        self._pending = None
+        self._process = None
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+    
+    def submit(self, job):
+        """Queue a job, cancelling whatever is running"""
+        with self._lock:
+            self._generation += 1
+            self._pending = (self._generation, job)
+            self._cancel()
+        self._wake.set()
+    
+    def stop(self):
+        with self._lock:
+            self._stopped = True
+            self._cancel()
+        self._wake.set()
+        self._thread.join(timeout=5)
+    
+    def _cancel(self):
+        process = self._process
+        if process is None or process.poll() is not None:
+            return
+        try:
+            if hasattr(os, "killpg"):
+                os.killpg(process.pid, signal.SIGTERM)
+            else:
+                process.terminate()
+        except OSError:
+            pass
+    
+    def _run(self):
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            with self._lock:
+                if self._stopped:
+                    return
+                pending, self._pending = self._pending, None
+            if pending is None:
+                continue
+            generation, job = pending
+            for label, cmd, log_path in job:
+                with self._lock:
+                    if self._stopped or generation != self._generation:
+                        break
+                    os.makedirs(os.path.dirname(log_path), exist_ok=True)
+                    log = open(log_path, "w")
+                    start = time.time()
+                    try:
+                        self._process = subprocess.Popen(cmd, stdout=log, stderr=subprocess.STDOUT,
+                                                         start_new_session=hasattr(os, "killpg"))
+                    except OSError as e:
+                        log.close()
+                        print(f"[watch] ✗ {label}: could not start {cmd[0]}: {e}")
+                        break
+                returncode = self._process.wait()
+                log.close()
+                with self._lock:
+                    self._process = None
+                    cancelled = generation != self._generation or self._stopped
+                if cancelled:
+                    print(f"[watch] … {label} cancelled by a newer edit")
+                    break
+                if returncode == 0:
+                    print(f"[watch] ✓ {label} ({time.time() - start:.1f}s)")
+                else:
+                    print(f"[watch] ✗ {label} failed, last lines of {log_path}:")
+                    with open(log_path, errors="replace") as f:
+                        for line in f.read().splitlines()[-12:]:
+                            print(f"    {line}")
+
 
 class RamSatAnimationRenderer:
     def __init__(self):
         self.animation_dir = "visualization/animations"
         self.output_dir = "visualization/output"
         self.quality = "high"  # Options: low, medium, high, production
-        
-        self.animations = {
-            "intro": "ramsey_overview_intro.py",
-            "pigeonhole": "pigeonhole_demo_anim.py",
-            "erdos": "erdos_probabilistic_anim.py",
-            "sat": "sat_verification_anim.py",
-            "evolution": "ramsey_graph_evolution.py",
-            "advanced": "ramsey_graph_evolution_advanced.py"
+        self.log_dir = os.path.join(self.output_dir, "logs")
+        self.times_file = os.path.join(self.output_dir, "render_times.json")
+        self._times_lock = threading.Lock()
+        self.manifest_file = os.path.join(self.output_dir, "build_manifest.json")
+        self._manifest_lock = threading.Lock()
+        # Where local helper modules imported by scenes may live
+        self.helper_dirs = [self.animation_dir, "."]
+        # Scenes import the shared ramsat package from the repository root,
+        # so every manim and helper process gets it on its path
+        root = os.path.dirname(os.path.abspath(__file__))
+        paths = [p for p in os.environ.get("PYTHONPATH", "").split(os.pathsep) if p]
+        if root not in paths:
+            os.environ["PYTHONPATH"] = os.pathsep.join([root] + paths)
+        self.quality_map = {
+            "low": "-ql",
+            "medium": "-qm",
+            "high": "-qh",
+            "production": "-qk"
         }
+        
+        self.index_file = os.path.join(self.output_dir, "scene_index.json")
+        self.counts_file = os.path.join(self.output_dir, "animation_counts.json")
+        self.chunk_dir = os.path.join(self.output_dir, "chunks")
+        self.profile_dir = os.path.join(self.output_dir, "profiles")
+        self.storyboard_dir = os.path.join(self.output_dir, "storyboards")
+        self.preview_dir = os.path.join(self.output_dir, "previews")
+        self.hooks_script = os.path.join("visualization", "manim_hooks.py")
+        self.tex_cache = TexCache("media", os.path.join(self.output_dir, "tex_cache.json"),
+                                  self.hooks_script)
+        # --set key=value options, passed to scenes as RAMSAT_<KEY> variables
+        self.scene_params = {}
+        
+        # name -> scene file, name -> scene class, alias -> name
+        self.animations = {}
+        self.scene_classes = {}
+        self.aliases = {}
+        self.discover_scenes()
     
-    def render_animation(self, name, quality=None):
-        """Render a specific animation by name"""
+    def _scan_files(self):
+        """Parse each scene file's classes, reusing cached results for unchanged files"""
+        try:
+            with open(self.index_file) as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            cached = {}
+        index = {}
+        for filename in sorted(os.listdir(self.animation_dir)):
+            if not filename.endswith(".py"):
+                continue
+            path = os.path.join(self.animation_dir, filename)
+            stat = os.stat(path)
+            entry = cached.get(filename)
+            if entry and entry["mtime"] == stat.st_mtime and entry["size"] == stat.st_size:
+                index[filename] = entry
+                continue
+            try:
+                classes = parse_scene_classes(path)
+            except SyntaxError as e:
+                print(f"Warning: skipping {path}: {e}")
+                classes = []
+            index[filename] = {"mtime": stat.st_mtime, "size": stat.st_size, "classes": classes}
+        if index != cached:
+            os.makedirs(self.output_dir, exist_ok=True)
+            with open(self.index_file, "w") as f:
+                json.dump(index, f, indent=1, sort_keys=True)
+        return index
+    
+    def discover_scenes(self):
+        """Build the scene table from Scene/ThreeDScene subclasses found by AST"""
+        index = self._scan_files()
+        classes = {}
+        for filename, entry in index.items():
+            for cls in entry["classes"]:
+                classes.setdefault(cls["name"], []).append((filename, cls))
+        
+        def is_scene(name, seen=()):
+            if name in SCENE_BASES:
+                return True
+            if name in seen or name not in classes:
+                return False
+            return any(is_scene(base, seen + (name,))
+                       for _, cls in classes[name] for base in cls["bases"])
+        
+        def renders(name, seen=()):
+            # A scene is renderable if it or a non-manim ancestor defines construct()
+            if name in seen or name not in classes:
+                return False
+            return any(cls["has_construct"] or any(renders(base, seen + (name,)) for base in cls["bases"])
+                       for _, cls in classes[name])
+        
+        self.animations = {}
+        self.scene_classes = {}
+        self.aliases = {}
+        per_file = {}
+        for class_name, defs in sorted(classes.items()):
+            if class_name.startswith("_") or not is_scene(class_name) or not renders(class_name):
+                continue
+            for filename, cls in defs:
+                stem = os.path.splitext(filename)[0]
+                name = class_name if len(defs) == 1 else f"{stem}:{class_name}"
+                self.animations[name] = filename
+                self.scene_classes[name] = class_name
+                per_file.setdefault(stem, []).append(name)
+        # A file holding exactly one scene can also be targeted by its stem
+        for stem, names in per_file.items():
+            if len(names) == 1 and stem not in self.animations:
+                self.aliases[stem] = names[0]
+        return self.animations
+    
+    def canonical_name(self, name):
+        """Map a class name, 'file:Class' or unique file stem to a scene name"""
+        if name in self.animations:
+            return name
+        if name in self.aliases:
+            return self.aliases[name]
+        matches = [n for n, cls in self.scene_classes.items() if cls == name]
+        if len(matches) == 1:
+            return matches[0]
+        return name
+    
+    def output_name(self, name):
+        """File-system safe movie name for a scene"""
+        return name.replace(":", "_")
+    
+    def _resolve(self, name):
+        """Return the scene file path for a name, or None after printing why"""
         if name not in self.animations:
             print(f"Error: Animation '{name}' not found!")
             print(f"Available animations: {', '.join(self.animations.keys())}")
-            return False
-        
-        filename = self.animations[name]
-        filepath = os.path.join(self.animation_dir, filename)
+            return None
         
+        filepath = os.path.join(self.animation_dir, self.animations[name])
         if not os.path.exists(filepath):
             print(f"Error: File '{filepath}' not found!")
-            return False
+            return None
+        return filepath
+    
+    def build_command(self, name, quality=None):
+        """Return the manim command line that renders one animation"""
+        filepath = os.path.join(self.animation_dir, self.animations[name])
+        quality_flag = quality if quality else self.quality
+        q_flag = self.quality_map.get(quality_flag, "-qh")
+        return [
+            "manim",
+            filepath,
+            self.scene_classes[name],
+            q_flag,
+            "-o", f"{self.output_name(name)}.mp4"
+        ]
+    
+    def scene_dependencies(self, filepath):
+        """Return the scene file plus every local helper it imports (transitively)"""
+        seen = []
+        pending = [os.path.normpath(filepath)]
+        while pending:
+            path = pending.pop()
+            if path in seen:
+                continue
+            seen.append(path)
+            pending.extend(local_imports(path, self.helper_dirs))
+        return sorted(seen)
+    
+    def output_path(self, name, quality=None, media_dir="media"):
+        """Return where manim writes the movie for an animation"""
+        quality_flag = quality if quality else self.quality
+        stem = os.path.splitext(os.path.basename(self.animations[name]))[0]
+        return os.path.join(media_dir, "videos", stem,
+                            QUALITY_DIRS.get(quality_flag, QUALITY_DIRS["high"]),
+                            f"{self.output_name(name)}.mp4")
+    
+    def set_scene_params(self, params):
+        """Export --set options to the environment that manim processes inherit"""
+        self.scene_params = dict(params)
+        for key, value in self.scene_params.items():
+            os.environ[scene_param_variable(key)] = value
+    
+    def _hash_sources(self, hasher, name):
+        """Feed the scene source, its helpers and the parameters they read to hasher"""
+        filepath = os.path.join(self.animation_dir, self.animations[name])
+        for path in self.scene_dependencies(filepath):
+            hasher.update(path.encode())
+            with open(path, "rb") as f:
+                source = f.read()
+            hasher.update(hashlib.sha256(source).digest())
+            for key, value in sorted(self.scene_params.items()):
+                if scene_param_variable(key).encode() in source:
+                    hasher.update(f"{key}={value}".encode())
+    
+    def source_hash(self, name):
+        """Hash the scene source, its helpers and the scene parameters they read"""
+        hasher = hashlib.sha256()
+        self._hash_sources(hasher, name)
+        return hasher.hexdigest()
+    
+    def build_hash(self, name, quality=None):
+        """Hash the scene source, its helpers, the manim flags and manim version
         
+        Scene parameters count only for scenes whose sources read them.
+        """
+        hasher = hashlib.sha256()
+        self._hash_sources(hasher, name)
+        hasher.update(" ".join(self.build_command(name, quality)[2:]).encode())
+        hasher.update(manim_version().encode())
+        return hasher.hexdigest()
+    
+    def _load_manifest(self):
+        """Load the build manifest: {name: {quality: {hash, output, ...}}}"""
+        try:
+            with open(self.manifest_file) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    def _update_manifest(self, name, quality, entry):
+        """Store one manifest entry (thread-safe)"""
+        with self._manifest_lock:
+            manifest = self._load_manifest()
+            manifest.setdefault(name, {})[quality] = entry
+            os.makedirs(self.output_dir, exist_ok=True)
+            with open(self.manifest_file, "w") as f:
+                json.dump(manifest, f, indent=2, sort_keys=True)
+    
+    def is_up_to_date(self, name, quality=None):
+        """True if the recorded build hash matches and the output still exists"""
         quality_flag = quality if quality else self.quality
-        quality_map = {
-            "low": "-ql",
-            "medium": "-qm",
-            "high": "-qh",
-            "production": "-qk"
-        }
+        entry = self._load_manifest().get(name, {}).get(quality_flag)
+        if not entry or not os.path.exists(entry.get("output", "")):
+            return False
+        return entry.get("hash") == self.build_hash(name, quality_flag)
+    
+    def _record_build(self, name, quality, build_hash):
+        """Record a successful render in the manifest"""
+        self._update_manifest(name, quality, {
+            "hash": build_hash,
+            "output": self.output_path(name, quality),
+            "manim": manim_version(),
+            "rendered_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        })
+    
+    def render_animation(self, name, quality=None, force=False):
+        """Render a specific animation by name"""
+        name = self.canonical_name(name)
+        filepath = self._resolve(name)
+        if filepath is None:
+            return False
         
-        q_flag = quality_map.get(quality_flag, "-qh")
+        quality_flag = quality if quality else self.quality
+        if not force and self.is_up_to_date(name, quality_flag):
+            print(f"✓ {name} is up to date ({quality_flag}), skipping")
+            return True
+        build_hash = self.build_hash(name, quality_flag)
         
         print(f"\n{'='*60}")
-        print(f"Rendering: {filename}")
+        print(f"Rendering: {self.animations[name]}")
         print(f"Quality: {quality_flag}")
         print(f"{'='*60}\n")
         
-        cmd = [
-            "manim",
-            filepath,
-            q_flag,
-            "-o", f"{name}.mp4"
-        ]
+        self.prewarm([name])
+        cmd = self.build_command(name, quality)
         
+        start = time.time()
         try:
             subprocess.run(cmd, check=True)
+            self._record_time(name, quality_flag, time.time() - start)
+            self._record_build(name, quality_flag, build_hash)
             print(f"\n✓ Successfully rendered {name}!")
             return True
         except subprocess.CalledProcessError as e:
             print(f"\n✗ Error rendering {name}: {e}")
             return False
     
-    def render_all(self, quality=None):
-        """Render all animations"""
+    def text_calls(self, name):
+        """Literal Tex/Text calls in a scene file and the helpers it imports
+        
+        If any Tex/MathTex is built from computed arguments, a scene run
+        entry (see scene_run_call) is added so the worker gathers those too.
+        """
+        filepath = os.path.join(self.animation_dir, self.animations[name])
+        calls = set()
+        computed = False
+        for path in self.scene_dependencies(filepath):
+            calls.update(collect_text_calls(path))
+            computed = computed or has_computed_tex_calls(path)
+        if computed:
+            calls.add(scene_run_call(filepath, self.scene_classes[name], self.source_hash(name)))
+        return sorted(calls)
+    
+    def prewarm(self, names):
+        """Compile the Tex/Text SVGs the given scenes need before manim runs"""
+        calls = sorted({call for name in names for call in self.text_calls(name)})
+        if not calls:
+            return
+        missing = len(self.tex_cache.missing(calls))
+        if missing:
+            print(f"Pre-warming {missing} of {len(calls)} Tex/Text fragments...")
+        compiled, failed = self.tex_cache.prewarm(calls)
+        for result in failed:
+            print(f"  ✗ {result['source']}: {result['error']}")
+        if missing:
+            print(f"  ✓ {compiled} compiled")
+        self.tex_cache.evict(protect=set(calls))
+    
+    def clean_cache(self):
+        """Evict down to the size cap and remove orphaned Tex/Text cache files"""
+        known = sorted({call for name in self.animations for call in self.text_calls(name)})
+        orphans = self.tex_cache.clean_orphans(known)
+        evicted, total = self.tex_cache.evict()
+        print(f"Removed {orphans} orphaned and {evicted} least recently used cache files")
+        print(f"Tex/Text cache: {total / 2**20:.1f} MB (cap {self.tex_cache.max_bytes / 2**20:.0f} MB)")
+    
+    def animation_count(self, name, quality=None):
+        """Number of play()/wait() calls in a scene, cached per build hash"""
+        build_hash = self.build_hash(name, quality)
+        try:
+            with open(self.counts_file) as f:
+                counts = json.load(f)
+        except (OSError, ValueError):
+            counts = {}
+        entry = counts.get(name)
+        if entry and entry["hash"] == build_hash:
+            return entry["count"]
+        
+        filepath = os.path.join(self.animation_dir, self.animations[name])
+        cmd = [sys.executable, self.hooks_script, "count", filepath, self.scene_classes[name]]
+        proc = subprocess.run(cmd, capture_output=True, text=True)
+        if proc.returncode != 0:
+            print(proc.stdout + proc.stderr)
+            return None
+        count = json.loads(proc.stdout.strip().splitlines()[-1])["animations"]
+        counts[name] = {"hash": build_hash, "count": count}
+        os.makedirs(self.output_dir, exist_ok=True)
+        with open(self.counts_file, "w") as f:
+            json.dump(counts, f, indent=2, sort_keys=True)
+        return count
+    
+    def split_ranges(self, count, chunks):
+        """Split animation indices 0..count-1 into contiguous inclusive ranges"""
+        chunks = max(1, min(chunks, count))
+        bounds = [round(i * count / chunks) for i in range(chunks + 1)]
+        return [(bounds[i], bounds[i + 1] - 1) for i in range(chunks)]
+    
+    def _render_chunk(self, name, quality, index, first, last):
+        """Render animations first..last of a scene into its own media folder"""
+        quality_flag = quality if quality else self.quality
+        media_dir = os.path.join(self.chunk_dir, f"{self.output_name(name)}_{quality_flag}", f"{index:03d}")
+        log_path = os.path.join(self.log_dir, f"{self.output_name(name)}_{quality_flag}_chunk{index:03d}.log")
+        cmd = self.build_command(name, quality) + ["-n", f"{first},{last}", "--media_dir", media_dir]
+        # Each chunk gets its own links to the warmed cache so concurrent
+        # compiles of loop-built strings never write the same file
+        self.tex_cache.link_into(media_dir)
+        with open(log_path, "w") as log:
+            try:
+                returncode = subprocess.run(cmd, stdout=log, stderr=subprocess.STDOUT).returncode
+            except OSError as e:
+                log.write(f"Could not start manim: {e}\n")
+                returncode = -1
+        movie = self.output_path(name, quality, media_dir)
+        return returncode == 0 and os.path.exists(movie), movie, log_path
+    
+    def concat_movies(self, movies, output):
+        """Join movies with identical encoding settings without re-encoding"""
+        os.makedirs(os.path.dirname(output), exist_ok=True)
+        list_path = output + ".concat.txt"
+        with open(list_path, "w") as f:
+            for movie in movies:
+                f.write(f"file '{os.path.abspath(movie)}'\n")
+        cmd = ["ffmpeg", "-y", "-loglevel", "error", "-f", "concat", "-safe", "0",
+               "-i", list_path, "-c", "copy", "-movflags", "+faststart", output]
+        try:
+            returncode = subprocess.run(cmd).returncode
+        finally:
+            os.remove(list_path)
+        return returncode == 0
+    
+    def render_chunked(self, name, quality=None, chunks=None, force=False):
+        """Render one scene as parallel ranges of animations, then concatenate"""
+        name = self.canonical_name(name)
+        if self._resolve(name) is None:
+            return False
+        quality_flag = quality if quality else self.quality
+        if not force and self.is_up_to_date(name, quality_flag):
+            print(f"✓ {name} is up to date ({quality_flag}), skipping")
+            return True
+        if shutil.which("ffmpeg") is None:
+            print("ffmpeg not found; rendering without chunks")
+            return self.render_animation(name, quality, force=True)
+        build_hash = self.build_hash(name, quality_flag)
+        
+        count = self.animation_count(name, quality_flag)
+        if count is None:
+            print(f"✗ Could not count animations in {name}")
+            return False
+        if count == 0:
+            # Nothing to split: a scene without play()/wait() is a still
+            return self.render_animation(name, quality, force=True)
+        workers = chunks if chunks else self.max_parallel_renders(quality_flag)
+        ranges = self.split_ranges(count, workers)
+        
+        print(f"\n{'='*60}")
+        print(f"Rendering: {self.animations[name]} ({count} animations in {len(ranges)} chunks)")
+        print(f"Quality: {quality_flag}")
+        print(f"{'='*60}\n")
+        
+        os.makedirs(self.log_dir, exist_ok=True)
+        start = time.time()
+        self.prewarm([name])
+        with ThreadPoolExecutor(max_workers=len(ranges)) as pool:
+            futures = [pool.submit(self._render_chunk, name, quality_flag, i, first, last)
+                       for i, (first, last) in enumerate(ranges)]
+            results = [future.result() for future in futures]
+        
+        for (first, last), (success, movie, log_path) in zip(ranges, results):
+            mark = "✓" if success else "✗"
+            print(f"{mark} animations {first:3d}-{last:3d}  (log: {log_path})")
+        if not all(success for success, _, _ in results):
+            print(f"\n✗ Error rendering {name}: a chunk failed")
+            return False
+        
+        output = self.output_path(name, quality_flag)
+        if not self.concat_movies([movie for _, movie, _ in results], output):
+            print(f"\n✗ Error joining chunks of {name}")
+            return False
+        shutil.rmtree(os.path.join(self.chunk_dir, f"{self.output_name(name)}_{quality_flag}"),
+                      ignore_errors=True)
+        self._record_time(name, quality_flag, time.time() - start)
+        self._record_build(name, quality_flag, build_hash)
+        print(f"\n✓ Successfully rendered {name} -> {output}")
+        return True
+    
+    def profile_animation(self, name, quality=None, top=15):
+        """Render a scene in-process, timing each play()/wait(), and rank the slowest"""
+        name = self.canonical_name(name)
+        filepath = self._resolve(name)
+        if filepath is None:
+            return None
+        quality_flag = quality if quality else self.quality
+        self.prewarm([name])
+        
+        os.makedirs(self.profile_dir, exist_ok=True)
+        prefix = os.path.join(self.profile_dir, f"{self.output_name(name)}_{quality_flag}")
+        print(f"\nProfiling {name} ({quality_flag})...")
+        cmd = [sys.executable, self.hooks_script, "profile", filepath,
+               self.scene_classes[name], quality_flag, prefix]
+        if subprocess.run(cmd).returncode != 0:
+            print(f"✗ Profiling {name} failed")
+            return None
+        
+        with open(prefix + ".json") as f:
+            report = json.load(f)
+        records = sorted(report["animations"], key=lambda r: r["wall_s"], reverse=True)
+        
+        print(f"\n{'='*60}")
+        print(f"SLOWEST ANIMATIONS: {name}")
+        print(f"{'='*60}")
+        print(f"{'#':>4} {'line':>5} {'wall':>8} {'share':>6} {'frames':>6} {'mobs':>6}  animations")
+        total = report["total_wall_s"] or 1.0
+        for record in records[:top]:
+            labels = ", ".join(record["animations"])
+            print(f"{record['index']:4d} {record['line'] or '?':>5} {record['wall_s']:7.2f}s "
+                  f"{100 * record['wall_s'] / total:5.1f}% {record['frames']:6d} {record['family']:6d}  {labels}")
+        print(f"\nTotal {report['total_wall_s']:.1f}s over {len(records)} animations")
+        print(f"Report: {prefix}.json   Flame stacks: {prefix}.folded")
+        return report
+    
+    def storyboard_command(self, name):
+        """Return (command, png path) for one scene's contact sheet"""
+        filepath = os.path.join(self.animation_dir, self.animations[name])
+        output = os.path.join(self.storyboard_dir, f"{self.output_name(name)}.png")
+        return [sys.executable, self.hooks_script, "storyboard", filepath, self.scene_classes[name], output], output
+    
+    def _storyboard_one(self, name):
+        """Build one scene's contact sheet; return (success, png or log path)"""
+        cmd, output = self.storyboard_command(name)
+        log_path = os.path.join(self.log_dir, f"{self.output_name(name)}_storyboard.log")
+        with open(log_path, "w") as log:
+            returncode = subprocess.run(cmd, stdout=log, stderr=subprocess.STDOUT).returncode
+        return returncode == 0, output if returncode == 0 else log_path
+    
+    def storyboard(self, names=None):
+        """Contact sheets of the last frame of every play(), no interpolation rendered"""
+        names = [self.canonical_name(name) for name in names] if names else list(self.animations)
+        names = [name for name in names if self._resolve(name) is not None]
+        if not names:
+            return {}
+        self.prewarm(names)
+        os.makedirs(self.log_dir, exist_ok=True)
+        
+        print(f"\n{'='*60}")
+        print(f"STORYBOARDS ({len(names)} scenes)")
+        print(f"{'='*60}\n")
+        results = {}
+        workers = max(1, min(len(names), self.max_parallel_renders("low")))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(self._storyboard_one, name): name for name in names}
+            for future in as_completed(futures):
+                name = futures[future]
+                success, path = future.result()
+                results[name] = success
+                mark = "✓" if success else "✗"
+                print(f"{mark} {name:40s} {path}")
+        return results
+    
+    def _load_times(self):
+        """Load past render durations keyed by animation and quality"""
+        try:
+            with open(self.times_file) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    def _record_time(self, name, quality, seconds):
+        """Remember how long a render took for longest-first scheduling"""
+        with self._times_lock:
+            times = self._load_times()
+            times.setdefault(name, {})[quality] = round(seconds, 2)
+            os.makedirs(self.output_dir, exist_ok=True)
+            with open(self.times_file, "w") as f:
+                json.dump(times, f, indent=2, sort_keys=True)
+    
+    def max_parallel_renders(self, quality=None):
+        """Cap concurrent renders by CPU count and available memory"""
+        quality_flag = quality if quality else self.quality
+        # Each manim process keeps roughly two cores busy (Cairo + ffmpeg)
+        by_cpu = max(1, (os.cpu_count() or 1) // 2)
+        memory = available_memory()
+        if memory is None:
+            return by_cpu
+        per_render = RENDER_MEMORY_ESTIMATE.get(quality_flag, RENDER_MEMORY_ESTIMATE["high"])
+        return max(1, min(by_cpu, memory // per_render))
+    
+    def schedule(self, names, quality=None):
+        """Order names longest-first using past run times (unknown ones first)"""
+        quality_flag = quality if quality else self.quality
+        times = self._load_times()
+        def expected(name):
+            return times.get(name, {}).get(quality_flag, float("inf"))
+        return sorted(names, key=expected, reverse=True)
+    
+    def _render_captured(self, name, quality=None):
+        """Render one animation with its output captured to a log file"""
+        quality_flag = quality if quality else self.quality
+        os.makedirs(self.log_dir, exist_ok=True)
+        log_path = os.path.join(self.log_dir, f"{self.output_name(name)}_{quality_flag}.log")
+        build_hash = self.build_hash(name, quality_flag)
+        start = time.time()
+        with open(log_path, "w") as log:
+            try:
+                returncode = subprocess.run(self.build_command(name, quality),
+                                            stdout=log, stderr=subprocess.STDOUT).returncode
+            except OSError as e:
+                log.write(f"Could not start manim: {e}\n")
+                returncode = -1
+        elapsed = time.time() - start
+        if returncode == 0:
+            self._record_time(name, quality_flag, elapsed)
+            self._record_build(name, quality_flag, build_hash)
+        return returncode == 0, elapsed, log_path
+    
+    def render_all_parallel(self, quality=None, jobs=None, force=False, only=None):
+        """Render all animations (or just `only`) concurrently, longest first"""
+        results = {}
+        elapsed = {}
+        names = []
+        for name in only or self.animations:
+            if self._resolve(name) is None:
+                results[name] = False
+            elif not force and self.is_up_to_date(name, quality):
+                print(f"✓ {name} is up to date, skipping")
+                results[name] = True
+            else:
+                names.append(name)
+        
+        workers = jobs if jobs else self.max_parallel_renders(quality)
+        workers = max(1, min(workers, len(names) or 1))
+        self.prewarm(names)
+        print(f"Running {len(names)} renders on {workers} worker(s)\n")
+        
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(self._render_captured, name, quality): name
+                       for name in self.schedule(names, quality)}
+            for future in as_completed(futures):
+                name = futures[future]
+                success, seconds, log_path = future.result()
+                results[name] = success
+                elapsed[name] = seconds
+                mark = "✓" if success else "✗"
+                print(f"{mark} {name:20s} {seconds:7.1f}s  (log: {log_path})")
+                if not success:
+                    with open(log_path) as log:
+                        tail = log.readlines()[-15:]
+                    print("".join("    " + line for line in tail))
+        return {name: results[name] for name in only or self.animations}, elapsed
+    
+    def render_all(self, quality=None, jobs=1, force=False):
+        """Render all animations (concurrently when jobs != 1); up-to-date ones are skipped"""
         print(f"\n{'='*60}")
         print("RENDERING ALL RAMSAT ANIMATIONS")
         print(f"{'='*60}\n")
         
-        results = {}
-        for name in self.animations.keys():
-            results[name] = self.render_animation(name, quality)
+        elapsed = {}
+        if jobs == 1:
+            results = {}
+            for name in self.animations.keys():
+                start = time.time()
+                results[name] = self.render_animation(name, quality, force)
+                elapsed[name] = time.time() - start
+        else:
+            results, elapsed = self.render_all_parallel(quality, jobs, force)
         
         print(f"\n{'='*60}")
         print("RENDERING SUMMARY")
         print(f"{'='*60}")
         for name, success in results.items():
             status = "✓ SUCCESS" if success else "✗ FAILED"
-            print(f"{name:20s}: {status}")
+            timing = f"  {elapsed[name]:7.1f}s" if name in elapsed else ""
+            print(f"{name:20s}: {status}{timing}")
         
         success_count = sum(results.values())
         total_count = len(results)
         print(f"\nTotal: {success_count}/{total_count} animations rendered successfully")
+        return results
+    
+    def _derived_entry(self, name, key):
+        return self._load_manifest().get(name, {}).get(key)
+    
+    def transcode_jobs(self, name, source_quality, tiers, gif=False, thumbnail=False, force=False):
+        """ffmpeg commands deriving lower tiers, a GIF and a thumbnail from one render"""
+        source = self.output_path(name, source_quality)
+        source_hash = self.build_hash(name, source_quality)
+        os.makedirs(self.preview_dir, exist_ok=True)
+        jobs = []
+        for tier in tiers:
+            if tier == source_quality:
+                continue
+            height, fps = quality_size(tier)
+            output = self.output_path(name, tier)
+            cmd = ["ffmpeg", "-y", "-loglevel", "error", "-i", source,
+                   "-vf", f"scale=-2:{height}:flags=lanczos,fps={fps}",
+                   "-c:v", "libx264", "-crf", "18", "-preset", "medium", "-pix_fmt", "yuv420p",
+                   "-c:a", "copy", "-movflags", "+faststart", output]
+            jobs.append((tier, output, cmd))
+        if gif:
+            output = os.path.join(self.preview_dir, f"{self.output_name(name)}.gif")
+            cmd = ["ffmpeg", "-y", "-loglevel", "error", "-i", source, "-vf",
+                   "fps=12,scale=480:-1:flags=lanczos,split[a][b];[a]palettegen[p];[b][p]paletteuse",
+                   output]
+            jobs.append(("gif", output, cmd))
+        if thumbnail:
+            output = os.path.join(self.preview_dir, f"{self.output_name(name)}.jpg")
+            # representative frame from the first ~10 s, not just frame 0
+            cmd = ["ffmpeg", "-y", "-loglevel", "error", "-i", source, "-t", "10",
+                   "-vf", "thumbnail=150,scale=640:-2", "-frames:v", "1", output]
+            jobs.append(("thumbnail", output, cmd))
+        
+        pending = []
+        for key, output, cmd in jobs:
+            entry = self._derived_entry(name, key)
+            if (not force and entry and entry.get("source_hash") == source_hash
+                    and entry.get("derived_from") == source_quality and os.path.exists(output)):
+                continue
+            pending.append((key, output, cmd))
+        return source_hash, pending
+    
+    def _run_transcode(self, name, key, output, cmd):
+        os.makedirs(os.path.dirname(output), exist_ok=True)
+        log_path = os.path.join(self.log_dir, f"{self.output_name(name)}_{key}.log")
+        start = time.time()
+        with open(log_path, "w") as log:
+            try:
+                returncode = subprocess.run(cmd, stdout=log, stderr=subprocess.STDOUT).returncode
+            except OSError as e:
+                log.write(f"Could not start ffmpeg: {e}\n")
+                returncode = -1
+        return returncode == 0, time.time() - start, log_path
+    
+    def render_tiers(self, tiers, gif=False, thumbnail=False, jobs=1, force=False):
+        """Render every scene once at the highest tier, then derive the rest with ffmpeg"""
+        tiers = sorted(set(tiers), key=list(QUALITY_DIRS).index)
+        source_quality = tiers[-1]
+        results = self.render_all(source_quality, jobs, force)
+        
+        work = []
+        for name, success in results.items():
+            if not success or not os.path.exists(self.output_path(name, source_quality)):
+                continue
+            source_hash, pending = self.transcode_jobs(name, source_quality, tiers, gif, thumbnail, force)
+            work.extend((name, source_hash, key, output, cmd) for key, output, cmd in pending)
+        
+        print(f"\n{'='*60}")
+        print(f"DERIVING {', '.join(tiers[:-1] + ['gif'] * gif + ['thumbnail'] * thumbnail) or 'nothing'}"
+              f" FROM {source_quality.upper()} ({len(work)} transcodes)")
+        print(f"{'='*60}")
+        if not work:
+            return results
+        os.makedirs(self.log_dir, exist_ok=True)
+        workers = max(1, min(len(work), os.cpu_count() or 1))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(self._run_transcode, name, key, output, cmd): (name, source_hash, key, output)
+                       for name, source_hash, key, output, cmd in work}
+            for future in as_completed(futures):
+                name, source_hash, key, output = futures[future]
+                success, seconds, log_path = future.result()
+                if success:
+                    entry = {
+                        "hash": self.build_hash(name, key) if key in QUALITY_DIRS else source_hash,
+                        "output": output,
+                        "derived_from": source_quality,
+                        "source_hash": source_hash,
+                        "rendered_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+                    }
+                    self._update_manifest(name, key, entry)
+                mark = "✓" if success else "✗"
+                print(f"{mark} {name:40s} {key:10s} {seconds:6.1f}s  {output if success else log_path}")
+        return results
+    
+    def probe(self, path):
+        """Stream parameters that must match for a stream-copy concat"""
+        cmd = ["ffprobe", "-v", "error", "-show_entries",
+               "stream=codec_type,codec_name,profile,width,height,pix_fmt,r_frame_rate,time_base,"
+               "sample_rate,channels", "-of", "json", path]
+        try:
+            proc = subprocess.run(cmd, capture_output=True, text=True)
+        except OSError:
+            return None
+        if proc.returncode != 0:
+            return None
+        streams = json.loads(proc.stdout).get("streams", [])
+        return tuple(tuple(sorted(stream.items())) for stream in streams)
+    
+    def assemble(self, names, quality=None, output=None, jobs=1, force=False):
+        """Concatenate scenes in order without re-encoding, re-rendering only stale ones"""
+        quality_flag = quality if quality else self.quality
+        names = [self.canonical_name(name) for name in names]
+        if not names or any(self._resolve(name) is None for name in names):
+            return False
+        if shutil.which("ffmpeg") is None or shutil.which("ffprobe") is None:
+            print("Error: assemble needs ffmpeg and ffprobe on PATH")
+            return False
+        output = output or os.path.join(self.output_dir, f"film_{quality_flag}.mp4")
+        
+        unique = list(dict.fromkeys(names))
+        stale = [name for name in unique if force or not self.is_up_to_date(name, quality_flag)]
+        if stale:
+            print(f"Re-rendering {len(stale)} stale scene(s): {', '.join(stale)}")
+            self._render_subset(stale, quality_flag, jobs, force=True)
+        
+        params = {name: self.probe(self.output_path(name, quality_flag)) for name in unique}
+        missing = [name for name, p in params.items() if p is None]
+        if missing:
+            print(f"✗ No readable output for: {', '.join(missing)}")
+            return False
+        # The most common parameter set is the reference; the odd ones out
+        # (older manim, transcoded tiers) get a native re-render
+        counts = {}
+        for p in params.values():
+            counts[p] = counts.get(p, 0) + 1
+        reference = max(counts, key=counts.get)
+        mismatched = [name for name, p in params.items() if p != reference]
+        if mismatched:
+            print(f"Re-rendering {len(mismatched)} scene(s) with mismatched stream parameters: "
+                  f"{', '.join(mismatched)}")
+            self._render_subset(mismatched, quality_flag, jobs, force=True)
+            still = [name for name in mismatched
+                     if self.probe(self.output_path(name, quality_flag)) != reference]
+            if still:
+                print(f"✗ Stream parameters still differ for: {', '.join(still)}")
+                for name in still:
+                    print(f"  {name}: {dict(self.probe(self.output_path(name, quality_flag))[0])}")
+                print(f"  expected: {dict(reference[0])}")
+                return False
+        
+        print(f"\nJoining {len(names)} scenes -> {output}")
+        start = time.time()
+        if not self.concat_movies([self.output_path(name, quality_flag) for name in names], output):
+            print("✗ ffmpeg concat failed")
+            return False
+        print(f"✓ Assembled {output} in {time.time() - start:.1f}s (stream copy)")
+        return True
+    
+    def _render_subset(self, names, quality, jobs, force):
+        if jobs == 1:
+            for name in names:
+                self.render_animation(name, quality, force)
+        else:
+            self.render_all_parallel(quality, jobs, force, only=names)
+    
+    def reverse_dependencies(self, names=None):
+        """Map every source file to the scenes that import it, directly or through helpers"""
+        users = {}
+        for name in names or self.animations:
+            filepath = os.path.join(self.animation_dir, self.animations[name])
+            for path in self.scene_dependencies(filepath):
+                users.setdefault(path, set()).add(name)
+        return users
+    
+    def _watch_snapshot(self, users):
+        """mtime of every scene file and every file a scene depends on"""
+        paths = set(users)
+        paths.update(os.path.normpath(os.path.join(self.animation_dir, filename))
+                     for filename in os.listdir(self.animation_dir) if filename.endswith(".py"))
+        mtimes = {}
+        for path in paths:
+            try:
+                mtimes[path] = os.stat(path).st_mtime_ns
+            except OSError:
+                pass
+        return mtimes
+    
+    def _start_observer(self, users, wake):
+        """Wake the watch loop on file events if watchdog is installed (else it just polls)"""
+        try:
+            from watchdog.events import FileSystemEventHandler
+            from watchdog.observers import Observer
+        except ImportError:
+            return None
+        
+        class Handler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                wake.set()
+        
+        observer = Observer()
+        directories = {os.path.dirname(os.path.abspath(path)) for path in users}
+        directories.add(os.path.abspath(self.animation_dir))
+        for directory in sorted(directories):
+            observer.schedule(Handler(), directory, recursive=False)
+        observer.start()
+        return observer
+    
+    def watch_job(self, names, storyboard=False):
+        """(label, command, log path) for each scene a watch cycle re-renders"""
+        job = []
+        for name in names:
+            log_path = os.path.join(self.log_dir, f"{self.output_name(name)}_watch.log")
+            if storyboard:
+                cmd, output = self.storyboard_command(name)
+                job.append((f"{name} -> {output}", cmd, log_path))
+            else:
+                job.append((f"{name} -> {self.output_path(name, 'low')}", self.build_command(name, "low"), log_path))
+        return job
+    
+    def watch(self, names=None, storyboard=False, interval=0.25):
+        """Re-render the scenes affected by each saved edit until interrupted
+        
+        Renders run at low quality with manim's partial-movie cache on, so
+        only the play() calls whose content changed are rendered again; with
+        storyboard=True a contact sheet is drawn instead. Helper modules map
+        to every scene importing them. A newer edit cancels the running render.
+        """
+        wanted = [self.canonical_name(name) for name in names] if names else None
+        if wanted and any(self._resolve(name) is None for name in wanted):
+            return
+        
+        def selected():
+            return [name for name in (wanted or self.animations) if name in self.animations]
+        
+        users = self.reverse_dependencies(selected())
+        mtimes = self._watch_snapshot(users)
+        wake = threading.Event()
+        observer = self._start_observer(users, wake)
+        worker = WatchWorker()
+        
+        print(f"\n{'='*60}")
+        print(f"WATCHING {self.animation_dir} ({len(selected())} scenes, {len(mtimes)} files)")
+        print(f"Mode: {'storyboard' if storyboard else 'low quality render'}, "
+              f"{'file events' if observer else f'polling every {interval}s'}. Ctrl+C to stop.")
+        print(f"{'='*60}\n")
+        try:
+            while True:
+                wake.wait(interval)
+                wake.clear()
+                current = self._watch_snapshot(users)
+                changed = sorted(path for path in set(current) | set(mtimes)
+                                 if current.get(path) != mtimes.get(path))
+                if not changed:
+                    continue
+                # Editors often write in several steps; let the save settle
+                time.sleep(0.05)
+                self.discover_scenes()
+                users = self.reverse_dependencies(selected())
+                mtimes = self._watch_snapshot(users)
+                affected = sorted({name for path in changed for name in users.get(path, ())})
+                print(f"[watch] changed: {', '.join(changed)}")
+                if not affected:
+                    print("[watch] no watched scene uses it")
+                    continue
+                print(f"[watch] → {', '.join(affected)}")
+                worker.submit(self.watch_job(affected, storyboard))
+        except KeyboardInterrupt:
+            print("\n[watch] stopped")
+        finally:
+            worker.stop()
+            if observer is not None:
+                observer.stop()
+                observer.join()
     
     def preview_animation(self, name):
         """Render and preview a specific animation"""
-        if name not in self.animations:
-            print(f"Error: Animation '{name}' not found!")
+        name = self.canonical_name(name)
+        filepath = self._resolve(name)
+        if filepath is None:
             return
         
         filename = self.animations[name]
-        filepath = os.path.join(self.animation_dir, filename)
         
         print(f"\n{'='*60}")
-        print(f"Previewing: {filename}")
+        print(f"Previewing: {filename} ({self.scene_classes[name]})")
         print(f"{'='*60}\n")
         
-        cmd = ["manim", filepath, "-pql"]
+        cmd = ["manim", filepath, self.scene_classes[name], "-pql"]
         
         try:
             subprocess.run(cmd, check=True)
@@ -108,10 +1414,70 @@ class RamSatAnimationRenderer:
         print("AVAILABLE RAMSAT ANIMATIONS")
         print(f"{'='*60}\n")
         
+        aliases = {}
+        for alias, name in self.aliases.items():
+            aliases.setdefault(name, []).append(alias)
         for i, (name, filename) in enumerate(self.animations.items(), 1):
-            print(f"{i}. {name:15s} -> {filename}")
+            alias_text = f"  (alias: {', '.join(aliases[name])})" if name in aliases else ""
+            print(f"{i:2d}. {name:40s} -> {filename}{alias_text}")
         print()
 
+def scene_param_variable(key):
+    """Environment variable a scene reads for a --set key"""
+    return "RAMSAT_" + key.upper().replace("-", "_")
+
+
+def pop_scene_params(args):
+    """Remove every '--set key=value' from args and return them as a dict"""
+    params = {}
+    while "--set" in args:
+        i = args.index("--set")
+        value = args[i + 1] if i + 1 < len(args) else ""
+        del args[i:i + 2]
+        if "=" not in value:
+            print(f"Warning: ignoring --set {value!r} (expected key=value)")
+            continue
+        key, value = value.split("=", 1)
+        params[key.strip()] = value.strip()
+    return params
+
+
+def pop_count_option(args, flag, default):
+    """Remove '<flag> N|auto' from args; auto becomes None (size from resources)
+    
+    Raises ValueError with a usage message unless N is a positive integer.
+    """
+    if flag not in args:
+        return default
+    i = args.index(flag)
+    value = args[i + 1] if i + 1 < len(args) else "auto"
+    del args[i:i + 2]
+    if value == "auto":
+        return None
+    if not value.isdigit() or int(value) < 1:
+        raise ValueError(f"{flag} expects a positive number or 'auto', got {value!r}")
+    return int(value)
+
+
+def pop_seconds_option(args, flag, default):
+    """Remove '<flag> S' from args and return S as a float
+    
+    Raises ValueError with a usage message unless S is a positive number.
+    """
+    if flag not in args:
+        return default
+    i = args.index(flag)
+    value = args[i + 1] if i + 1 < len(args) else ""
+    del args[i:i + 2]
+    try:
+        seconds = float(value)
+    except ValueError:
+        seconds = None
+    if seconds is None or not 0 < seconds < float("inf"):
+        raise ValueError(f"{flag} expects a positive number of seconds, got {value!r}")
+    return seconds
+
+
 def main():
     renderer = RamSatAnimationRenderer()
     
@@ -120,45 +1486,150 @@ def main():
         print("=" * 60)
         print("\nUsage:")
         print("  python main.py list                    - List all animations")
-        print("  python main.py render <name> [quality] - Render specific animation")
-        print("  python main.py render-all [quality]    - Render all animations")
+        print("  python main.py render <name> [quality] [--chunks N|auto]")
+        print("                                         - Render specific animation (split across cores with --chunks)")
+        print("  python main.py render-all [quality] [--jobs N|auto]")
+        print("                                         - Render all animations (in parallel with --jobs)")
+        print("  python main.py render-all --tiers low,medium,high [--gif] [--thumbnails]")
+        print("                                         - Render once at the top tier, derive the rest with ffmpeg")
         print("  python main.py preview <name>          - Preview animation (low quality)")
+        print("  python main.py assemble <name> ... [--quality Q] [--output film.mp4] [--playlist file]")
+        print("                                         - Join scenes in order without re-encoding")
+        print("  python main.py storyboard [name ...]   - Contact sheet of each play()'s last frame")
+        print("  python main.py profile <name> [quality] - Time each play()/wait() of a scene")
+        print("  python main.py watch [name ...] [--storyboard] [--interval S]")
+        print("                                         - Re-render scenes affected by each edit (low quality)")
+        print("  python main.py clean-cache             - Trim the shared Tex/Text cache")
+        print("\nAny command accepts --set key=value (repeatable), passed to scenes as RAMSAT_<KEY>;")
+        print("CompleteGraphFamily reads sizes, clique, seed and highlight.")
         print("\nQuality options: low, medium, high, production")
+        print("Renders whose scene source, helpers, quality and manim version are unchanged")
+        print("are skipped; add --force to render-all or render to re-render anyway.")
+        print("Literal Tex/Text strings are compiled in parallel before each render into")
+        print(f"media/Tex and media/texts, capped at RAMSAT_TEX_CACHE_MB (default {TEX_CACHE_MB}).")
         print("\nExamples:")
         print("  python main.py list")
-        print("  python main.py render intro")
-        print("  python main.py render erdos high")
+        print("  python main.py render RamseyIntro")
+        print("  python main.py render ErdosProbabilisticLowerBound high")
+        print("  python main.py render erdos high        (file name works when it holds one scene)")
+        print("  python main.py render SATRamseyVerification production --chunks auto")
         print("  python main.py render-all medium")
+        print("  python main.py render-all high --jobs auto")
         print("  python main.py preview sat")
+        print("  python main.py storyboard")
+        print("  python main.py render CompleteGraphFamily low --set sizes=5,6,20,40 --set clique=4")
         renderer.list_animations()
         return
     
     command = sys.argv[1].lower()
+    args = sys.argv[2:]
+    force = "--force" in args
+    if force:
+        args.remove("--force")
+    renderer.set_scene_params(pop_scene_params(args))
     
     if command == "list":
         renderer.list_animations()
     
     elif command == "render":
-        if len(sys.argv) < 3:
+        try:
+            chunks = pop_count_option(args, "--chunks", 1)
+        except ValueError as e:
+            print(f"Error: {e}")
+            return
+        if not args:
             print("Error: Please specify animation name")
             renderer.list_animations()
             return
         
-        name = sys.argv[2]
-        quality = sys.argv[3] if len(sys.argv) > 3 else None
-        renderer.render_animation(name, quality)
+        name = args[0]
+        quality = args[1] if len(args) > 1 else None
+        if chunks == 1:
+            renderer.render_animation(name, quality, force)
+        else:
+            renderer.render_chunked(name, quality, chunks, force)
     
     elif command == "render-all":
-        quality = sys.argv[2] if len(sys.argv) > 2 else None
-        renderer.render_all(quality)
+        try:
+            jobs = pop_count_option(args, "--jobs", 1)
+        except ValueError as e:
+            print(f"Error: {e}")
+            return
+        tiers = None
+        if "--tiers" in args:
+            i = args.index("--tiers")
+            tiers = args[i + 1].split(",") if i + 1 < len(args) else []
+            del args[i:i + 2]
+        gif = "--gif" in args
+        thumbnail = "--thumbnails" in args
+        args = [arg for arg in args if arg not in ("--gif", "--thumbnails")]
+        quality = args[0] if args else None
+        if tiers or gif or thumbnail:
+            tiers = tiers or [quality or renderer.quality]
+            unknown = [tier for tier in tiers if tier not in QUALITY_DIRS]
+            if unknown:
+                print(f"Unknown quality tier(s): {', '.join(unknown)}")
+                return
+            renderer.render_tiers(tiers, gif, thumbnail, jobs, force)
+        else:
+            renderer.render_all(quality, jobs, force)
+    
+    elif command == "assemble":
+        try:
+            jobs = pop_count_option(args, "--jobs", 1)
+        except ValueError as e:
+            print(f"Error: {e}")
+            return
+        options = {}
+        for flag in ("--quality", "--output", "--playlist"):
+            if flag in args:
+                i = args.index(flag)
+                options[flag] = args[i + 1] if i + 1 < len(args) else None
+                del args[i:i + 2]
+        names = list(args)
+        if options.get("--playlist"):
+            with open(options["--playlist"]) as f:
+                names += [line.split("#", 1)[0].strip() for line in f
+                          if line.split("#", 1)[0].strip()]
+        if not names:
+            print("Error: Please list the scenes to assemble (or pass --playlist)")
+            renderer.list_animations()
+            return
+        renderer.assemble(names, options.get("--quality"), options.get("--output"), jobs, force)
+    
+    elif command == "storyboard":
+        renderer.storyboard(args)
+    
+    elif command == "profile":
+        if not args:
+            print("Error: Please specify animation name")
+            renderer.list_animations()
+            return
+        
+        name = args[0]
+        quality = args[1] if len(args) > 1 else None
+        renderer.profile_animation(name, quality)
+    
+    elif command == "watch":
+        storyboard = "--storyboard" in args
+        try:
+            interval = pop_seconds_option(args, "--interval", 0.25)
+        except ValueError as e:
+            print(f"Error: {e}")
+            return
+        names = [arg for arg in args if arg != "--storyboard"]
+        renderer.watch(names, storyboard, interval)
+    
+    elif command == "clean-cache":
+        renderer.clean_cache()
     
     elif command == "preview":
-        if len(sys.argv) < 3:
+        if not args:
             print("Error: Please specify animation name")
             renderer.list_animations()
             return
         
-        name = sys.argv[2]
+        name = args[0]
         renderer.preview_animation(name)
     
     else:
@@ -0,0 +1,21 @@
+"""Graph core shared by the Ramsey calculator and the Manim scenes
+
+Colourings of K_n are stored packed: one uint8 per edge in upper-triangle
+(numpy.triu_indices) order, 1 = red and 0 = blue. Only numpy is needed,
+so scenes and the GUI can import this cheaply.
+"""
+from .colouring import (BLUE, RED, colour_matrix, edge_index, edge_key, edge_list, edge_pairs,
+                        pack_matrix, random_colouring)
+from .layouts import circular_layout, sphere_layout
+from .cliques import (clique_edges, clique_indices, find_monochromatic_clique, monochromatic_cliques,
+                      search_clique)
+from .sampling import count_monochromatic, empirical_distribution, expected_monochromatic, sample_counts
+from .sat import ramsey_cnf, ramsey_trace, solve_cnf
+
+__all__ = [
+    "BLUE", "RED", "colour_matrix", "edge_index", "edge_key", "edge_list", "edge_pairs",
+    "pack_matrix", "random_colouring", "circular_layout", "sphere_layout", "clique_edges",
+    "clique_indices", "find_monochromatic_clique", "monochromatic_cliques", "search_clique",
+    "count_monochromatic", "empirical_distribution", "expected_monochromatic", "sample_counts",
+    "ramsey_cnf", "ramsey_trace", "solve_cnf",
+]
@@ -0,0 +1,93 @@
+"""Monochromatic clique search on packed colourings
+
+Small cases (up to MAX_ENUMERATED k-subsets) test every k-subset at once
+against cached index arrays; larger ones fall back to a backtracking
+search over same-colour neighbours.
+"""
+from functools import lru_cache
+from itertools import combinations
+from math import comb
+
+import numpy as np
+
+from .colouring import colour_matrix
+
+MAX_ENUMERATED = 200_000
+BLOCK = 16_384
+
+
+@lru_cache(maxsize=64)
+def clique_indices(n, k):
+    """All k-subsets of range(n) as a (C, k) array, in combinations order"""
+    cliques = np.array(list(combinations(range(n), k)), dtype=np.int32).reshape(-1, k)
+    cliques.flags.writeable = False
+    return cliques
+
+
+@lru_cache(maxsize=64)
+def clique_edges(n, k):
+    """Packed edge indices of every k-subset, shape (C, k*(k-1)/2)"""
+    cliques = clique_indices(n, k).astype(np.int64)
+    a, b = np.triu_indices(k, k=1)
+    i, j = cliques[:, a], cliques[:, b]
+    edges = i * (2 * n - i - 1) // 2 + (j - i - 1)
+    edges.flags.writeable = False
+    return edges
+
+
+def monochromatic_cliques(n, codes, k, colour=None):
+    """Every monochromatic k-clique and its colour, as ((m, k) array, (m,) array)"""
+    codes = np.asarray(codes)
+    edge_colours = codes[clique_edges(n, k)]
+    first = edge_colours[:, :1]
+    mono = np.all(edge_colours == first, axis=1)
+    if colour is not None:
+        mono &= first[:, 0] == colour
+    return clique_indices(n, k)[mono], first[mono, 0]
+
+
+def search_clique(rows, k, colour):
+    """Backtracking search on a nested-list colour matrix; returns (clique or None, subsets examined)"""
+    n = len(rows)
+    examined = 0
+
+    def extend(clique, candidates):
+        nonlocal examined
+        if len(clique) == k:
+            return clique
+        for idx, v in enumerate(candidates):
+            if len(clique) + len(candidates) - idx < k:
+                break
+            examined += 1
+            row = rows[v]
+            found = extend(clique + (v,), [u for u in candidates[idx + 1:] if row[u] == colour])
+            if found is not None:
+                return found
+        return None
+
+    return extend((), list(range(n))), examined
+
+
+def find_monochromatic_clique(n, codes, k, colour, matrix=None):
+    """First k-clique whose edges all have `colour`; returns (clique or None, subsets examined)
+
+    Uses the vectorised test over cached k-subsets, block by block so a hit
+    stops early, when there are at most MAX_ENUMERATED of them; otherwise
+    backtracks over `matrix` (built from codes if not given).
+    """
+    if k > n:
+        return None, 0
+    if k == 1:
+        return (0,), 1
+    if comb(n, k) <= MAX_ENUMERATED:
+        codes = np.asarray(codes)
+        edges = clique_edges(n, k)
+        for start in range(0, len(edges), BLOCK):
+            hits = np.flatnonzero(np.all(codes[edges[start:start + BLOCK]] == colour, axis=1))
+            if len(hits):
+                clique = tuple(clique_indices(n, k)[start + hits[0]].tolist())
+                return clique, int(start + hits[0] + 1)
+        return None, len(edges)
+    if matrix is None:
+        matrix = colour_matrix(n, codes)
+    return search_clique(matrix.tolist(), k, colour)
@@ -0,0 +1,69 @@
+"""Packed edge colourings of complete graphs"""
+from functools import lru_cache
+
+import numpy as np
+
+RED = 1
+BLUE = 0
+
+
+# Largest K_n whose edge index arrays are kept (about 8 MB at n = 1000)
+MAX_CACHED_PAIRS_N = 1000
+
+
+def _triu_pairs(n):
+    i, j = np.triu_indices(n, k=1)
+    i.flags.writeable = False
+    j.flags.writeable = False
+    return i, j
+
+
+_cached_pairs = lru_cache(maxsize=16)(_triu_pairs)
+
+
+def edge_pairs(n):
+    """(i, j) index arrays of every edge of K_n, i < j, in packed order
+
+    Cached for n <= MAX_CACHED_PAIRS_N; larger graphs (the GUI's n = 5000
+    matrix view is 200 MB of pairs) build them on each call.
+    """
+    return _cached_pairs(n) if n <= MAX_CACHED_PAIRS_N else _triu_pairs(n)
+
+
+def edge_list(n):
+    """Edges of K_n as (i, j) tuples in packed order (same as itertools.combinations)"""
+    i, j = edge_pairs(n)
+    return list(zip(i.tolist(), j.tolist()))
+
+
+def edge_key(i, j):
+    """Canonical (smaller, larger) key of an undirected edge"""
+    return (i, j) if i < j else (j, i)
+
+
+def edge_index(n, i, j):
+    """Position of edge {i, j} in the packed colour array of K_n"""
+    i, j = edge_key(i, j)
+    return i * (2 * n - i - 1) // 2 + (j - i - 1)
+
+
+def colour_matrix(n, codes):
+    """Symmetric uint8 colour matrix (255 on the diagonal) from packed codes"""
+    M = np.full((n, n), 255, dtype=np.uint8)
+    i, j = edge_pairs(n)
+    M[i, j] = codes
+    M[j, i] = codes
+    return M
+
+
+def pack_matrix(M):
+    """Packed codes of a colour matrix"""
+    i, j = edge_pairs(len(M))
+    return M[i, j]
+
+
+def random_colouring(n, rng=None, p_red=0.5):
+    """Uniformly random packed colouring of K_n"""
+    rng = rng if rng is not None else np.random.default_rng()
+    i, _ = edge_pairs(n)
+    return (rng.random(len(i)) < p_red).astype(np.uint8)
@@ -0,0 +1,18 @@
+"""Vertex layouts as (n, 3) arrays"""
+import numpy as np
+
+
+def circular_layout(n, radius=1.0, start_angle=0.0, center=(0.0, 0.0, 0.0)):
+    """n points evenly spaced on a circle in the z = 0 plane"""
+    angles = start_angle + 2 * np.pi * np.arange(n) / n
+    points = np.column_stack((np.cos(angles), np.sin(angles), np.zeros(n))) * radius
+    return points + np.asarray(center, dtype=float)
+
+
+def sphere_layout(n, radius=1.0, center=(0.0, 0.0, 0.0)):
+    """n points spread over a sphere with the golden spiral"""
+    k = np.arange(n)
+    theta = np.arccos(1 - 2 * (k + 0.5) / n)
+    phi = np.pi * (1 + 5 ** 0.5) * k
+    points = np.column_stack((np.cos(phi) * np.sin(theta), np.sin(phi) * np.sin(theta), np.cos(theta)))
+    return points * radius + np.asarray(center, dtype=float)
@@ -0,0 +1,82 @@
+"""Monte Carlo distribution of monochromatic cliques in random colourings
+
+X counts the monochromatic K_k in a uniformly random red/blue colouring
+of K_n, so E[X] = C(n, k) * 2^(1 - C(k, 2)). When E[X] < 1 some colouring
+has X = 0, which is Erdős' lower bound R(k, k) > n.
+"""
+import os
+import tempfile
+from math import comb
+
+import numpy as np
+
+from .cliques import BLOCK, clique_edges
+
+
+def expected_monochromatic(n, k):
+    """E[X] for a uniformly random colouring of K_n"""
+    return comb(n, k) * 2.0 ** (1 - comb(k, 2))
+
+
+def count_monochromatic(n, k, codes):
+    """Monochromatic K_k per colouring for a (B, E) block of packed colourings"""
+    codes = np.asarray(codes, dtype=np.uint8)
+    colours = codes[:, clique_edges(n, k)]
+    return np.count_nonzero(colours.min(axis=2) == colours.max(axis=2), axis=1)
+
+
+def _count_bits(n, k, words):
+    """count_monochromatic for colourings held as bit masks (E <= 64)"""
+    masks = np.bitwise_or.reduce(np.left_shift(np.uint64(1), clique_edges(n, k).astype(np.uint64)), axis=1)
+    hits = words[:, None] & masks[None, :]
+    return np.count_nonzero((hits == 0) | (hits == masks[None, :]), axis=1)
+
+
+def sample_counts(n, k, samples, seed=0, block=BLOCK):
+    """X for `samples` random colourings of K_n, drawn block by block"""
+    rng = np.random.default_rng(seed)
+    edges = comb(n, 2)
+    counts = np.empty(samples, dtype=np.int64)
+    for start in range(0, samples, block):
+        size = min(block, samples - start)
+        if edges <= 64:
+            words = rng.integers(np.iinfo(np.uint64).max, size=size, dtype=np.uint64, endpoint=True)
+            if edges < 64:
+                words &= np.uint64((1 << edges) - 1)
+            counts[start:start + size] = _count_bits(n, k, words)
+        else:
+            codes = rng.integers(0, 2, size=(size, edges), dtype=np.uint8)
+            counts[start:start + size] = count_monochromatic(n, k, codes)
+    return counts
+
+
+def empirical_distribution(n, k, samples=1_000_000, seed=0, cache_dir=None):
+    """Histogram of X over `samples` colourings, with its mean and the exact E[X]
+
+    Returns a dict with ``histogram`` (histogram[x] = colourings with X = x),
+    ``probability``, ``mean``, ``expected`` and the parameters. With a
+    cache_dir the result is stored as erdos_<n>_<k>_<samples>_<seed>.npz
+    and later calls load it instead of sampling again.
+    """
+    path = os.path.join(cache_dir, f"erdos_{n}_{k}_{samples}_{seed}.npz") if cache_dir else None
+    if path and os.path.exists(path):
+        with np.load(path) as data:
+            histogram = data["histogram"]
+    else:
+        histogram = np.bincount(sample_counts(n, k, samples, seed))
+        if path:
+            os.makedirs(cache_dir, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=cache_dir, suffix=".npz")
+            with os.fdopen(fd, "wb") as f:
+                np.savez_compressed(f, histogram=histogram)
+            os.replace(tmp, path)
+    return {
+        "n": n,
+        "k": k,
+        "samples": samples,
+        "seed": seed,
+        "histogram": histogram,
+        "probability": histogram / samples,
+        "mean": float(np.dot(np.arange(len(histogram)), histogram) / samples),
+        "expected": expected_monochromatic(n, k),
+    }
@@ -0,0 +1,187 @@
+"""Ramsey CNF encoding and a DPLL solver that records its search
+
+Variable v (1-based) is edge edge_list(n)[v - 1]; true means red. Each
+s-subset gets a clause forbidding an all-red K_s and each t-subset one
+forbidding an all-blue K_t, so the formula is satisfiable exactly when
+some colouring of K_n has neither, i.e. when R(s, t) > n.
+
+A trace is a small JSON document:
+
+  {"version", "instance": {s, t, n, vars, clauses}, "result": "SAT" | "UNSAT",
+   "model": "0110..." or null, "stats": {decisions, propagations, conflicts, events, solve_s},
+   "events": [...], "truncated": bool}
+
+with events as compact lists:
+
+  ["d", level, var, value]                       decision
+  ["p", level, var, value, clause]               unit propagation
+  ["c", level, clause, clique, colour, assigned] conflict; assigned is one
+                                                 "1"/"0"/"." per variable
+  ["b", level]                                   backtrack to level
+"""
+import json
+import os
+import tempfile
+import time
+
+from .cliques import clique_edges, clique_indices
+
+TRACE_VERSION = 1
+MAX_EVENTS = 2000
+
+
+def ramsey_cnf(n, s, t):
+    """Clauses (lists of signed variables) and the clique each one forbids
+
+    Returns (num_vars, clauses, cliques) where cliques[c] is (vertices, colour).
+    """
+    clauses = []
+    cliques = []
+    for k, sign, colour in ((s, -1, 1), (t, 1, 0)):
+        if k > n:
+            continue
+        for vertices, edges in zip(clique_indices(n, k).tolist(), clique_edges(n, k).tolist()):
+            clauses.append([sign * (e + 1) for e in edges])
+            cliques.append((vertices, colour))
+    return n * (n - 1) // 2, clauses, cliques
+
+
+def _snapshot(assign):
+    return "".join("." if v is None else str(int(v)) for v in assign[1:])
+
+
+def solve_cnf(num_vars, clauses, cliques=None, max_events=MAX_EVENTS):
+    """Chronological-backtracking DPLL with unit propagation
+
+    Returns (model, trace_fields) where model is a list of bools per
+    variable (index 0 unused) or None when unsatisfiable. At most
+    max_events events are kept; the stats always count the whole search.
+    """
+    occurs = {}
+    for ci, clause in enumerate(clauses):
+        for lit in clause:
+            occurs.setdefault(lit, []).append(ci)
+
+    assign = [None] * (num_vars + 1)
+    trail = []
+    decisions = []  # (trail length before, var, value, flipped)
+    events = []
+    stats = {"decisions": 0, "propagations": 0, "conflicts": 0, "events": 0}
+
+    def emit(event):
+        stats["events"] += 1
+        if len(events) < max_events:
+            events.append(event)
+
+    def value(lit):
+        v = assign[abs(lit)]
+        return None if v is None else (v if lit > 0 else not v)
+
+    def set_literal(lit):
+        assign[abs(lit)] = lit > 0
+        trail.append(abs(lit))
+
+    def undo_to(length):
+        while len(trail) > length:
+            assign[trail.pop()] = None
+
+    def propagate(queue):
+        while queue:
+            lit = queue.pop()
+            for ci in occurs.get(-lit, ()):
+                free = None
+                open_count = 0
+                for other in clauses[ci]:
+                    val = value(other)
+                    if val:
+                        break
+                    if val is None:
+                        open_count += 1
+                        free = other
+                else:
+                    if open_count == 0:
+                        return ci
+                    if open_count == 1:
+                        set_literal(free)
+                        stats["propagations"] += 1
+                        emit(["p", len(decisions), abs(free), int(free > 0), ci])
+                        queue.append(free)
+        return None
+
+    def conflict(ci):
+        stats["conflicts"] += 1
+        clique, colour = cliques[ci] if cliques else (None, None)
+        emit(["c", len(decisions), ci, clique, colour, _snapshot(assign)])
+
+    if any(len(clause) == 0 for clause in clauses):
+        return None, {"events": events, "stats": stats}
+    # unit clauses hold at level 0
+    queue = []
+    for ci, clause in enumerate(clauses):
+        if len(clause) == 1:
+            if value(clause[0]) is False:
+                conflict(ci)
+                return None, {"events": events, "stats": stats}
+            if value(clause[0]) is None:
+                set_literal(clause[0])
+                queue.append(clause[0])
+
+    while True:
+        ci = propagate(queue)
+        if ci is not None:
+            conflict(ci)
+            while decisions and decisions[-1][3]:
+                decisions.pop()
+            if not decisions:
+                return None, {"events": events, "stats": stats}
+            length, var, val, _ = decisions.pop()
+            undo_to(length)
+            emit(["b", len(decisions)])
+            decisions.append((length, var, not val, True))
+            lit = var if not val else -var
+            set_literal(lit)
+            queue = [lit]
+            continue
+        var = next((v for v in range(1, num_vars + 1) if assign[v] is None), None)
+        if var is None:
+            return list(assign), {"events": events, "stats": stats}
+        decisions.append((len(trail), var, True, False))
+        stats["decisions"] += 1
+        set_literal(var)
+        emit(["d", len(decisions), var, 1])
+        queue = [var]
+
+
+def ramsey_trace(s, t, n, cache_dir=None, max_events=MAX_EVENTS):
+    """Solve the (s, t, n) Ramsey instance, or load its trace from cache_dir
+
+    Traces are written to <cache_dir>/ramsey_<s>_<t>_<n>.json, so repeated
+    renders read the file instead of solving again.
+    """
+    path = os.path.join(cache_dir, f"ramsey_{s}_{t}_{n}.json") if cache_dir else None
+    if path and os.path.exists(path):
+        with open(path) as f:
+            trace = json.load(f)
+        if trace.get("version") == TRACE_VERSION:
+            return trace
+
+    num_vars, clauses, cliques = ramsey_cnf(n, s, t)
+    start = time.perf_counter()
+    model, fields = solve_cnf(num_vars, clauses, cliques, max_events)
+    stats = dict(fields["stats"], solve_s=round(time.perf_counter() - start, 6))
+    trace = {
+        "version": TRACE_VERSION,
+        "instance": {"s": s, "t": t, "n": n, "vars": num_vars, "clauses": len(clauses)},
+        "result": "UNSAT" if model is None else "SAT",
+        "model": None if model is None else _snapshot(model),
+        "stats": stats,
+        "events": fields["events"],
+        "truncated": stats["events"] > len(fields["events"]),
+    }
+    if path:
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(trace, f, separators=(",", ":"))
+        os.replace(tmp, path)
+    return trace
@@ -0,0 +1,38 @@
+import os
+import re
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                "visualization", "animations"))
+
+import tex_batch
+
+PREAMBLE = "\\documentclass[preview]{standalone}\n\\usepackage{amsmath}\n"
+
+
+def fake_run(calls, pages):
+    """Stand-in for subprocess.run that writes pages the way dvisvgm names them"""
+    def run(cmd, **kwargs):
+        calls.append(cmd[0])
+        if cmd[0] == "dvisvgm":
+            pattern = next(arg for arg in cmd if arg.startswith("--output="))[len("--output="):]
+            for page in range(1, pages + 1):
+                # %p is zero-padded to the digits of the page count; %<w>p to w digits
+                name = re.sub(r"%(\d*)p", lambda m: str(page).zfill(int(m.group(1) or len(str(pages)))),
+                              pattern)
+                Path(name).write_text(f"<svg>{page}</svg>")
+    return run
+
+
+def test_twelve_fragments_compile_in_one_batch(tmp_path, monkeypatch):
+    calls = []
+    monkeypatch.setattr(tex_batch.subprocess, "run", fake_run(calls, 12))
+    template = SimpleNamespace(tex_compiler="latex", output_format=".dvi")
+    svgs = [tmp_path / f"fragment{i}.svg" for i in range(12)]
+    bodies = [f"$x_{{{i}}}$" for i in range(12)]
+
+    assert tex_batch._compile_batch(template, svgs, bodies, PREAMBLE, tmp_path)
+    assert calls == ["latex", "dvisvgm"]
+    assert [svg.read_text() for svg in svgs] == [f"<svg>{i}</svg>" for i in range(1, 13)]
@@ -0,0 +1,28 @@
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "code"))
+
+from calculator import estimation_cache, ramsey_calculator
+from instrumentation import run_tracer
+
+
+def test_traced_estimate_exports_json():
+    tracer = run_tracer()
+    calculator = ramsey_calculator(tracer=tracer, cache=estimation_cache(seed=1))
+    result, success = calculator.estimate_ramsey(3, 3, 20)
+    assert success and result is not None
+
+    doc = json.loads(tracer.to_json())
+    counters = {entry["name"] for entry in doc["metadata"]["counters"]}
+    assert "subsets_examined" in counters
+    assert all(type(entry["value"]) is int for entry in doc["metadata"]["counters"])
+
+
+def test_count_stores_numpy_integers_as_int():
+    import numpy as np
+
+    tracer = run_tracer()
+    tracer.count("subsets_examined", np.int64(3), n=5)
+    assert type(tracer.counters[("subsets_examined", (("n", 5),))]) is int
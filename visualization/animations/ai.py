@@ -1,5 +1,7 @@
 from manim import *
 import numpy as np
+from graph_mobjects import EdgeBatch, random_pairs
+from scene_rng import SceneRandom
 
 # Run:
 # manim -pql inevitable_islands_sparse_centered.py InevitableIslandsNeuralSparse_Centered
@@ -7,7 +9,7 @@ import numpy as np
 
 class InevitableIslandsNeuralSparse_Centered(ThreeDScene):
     def construct(self):
-        np.random.seed(42)
+        rand = SceneRandom(type(self).__name__, seed=42)
 
         LAYERS, N_PER_LAYER = 6, 16
         LAYER_SPACING, NODE_SPREAD = 1.2, 2.2
@@ -30,21 +32,13 @@ class InevitableIslandsNeuralSparse_Centered(ThreeDScene):
         self.add(dots)
 
         # --- Sparse deterministic edges ---
-        lines = VGroup()
+        # All 350 edges live in one EdgeBatch (a VMobject per colour); each
+        # edge takes the midpoint of its old base->white gradient
         desired_edges = 350
-        edge_pairs = set()
-        while len(edge_pairs) < desired_edges:
-            i, j = np.random.randint(0, TOTAL_NODES, 2)
-            if i != j and abs(i - j) > 4:
-                edge_pairs.add((i, j))
-        for (i, j) in edge_pairs:
-            src, tgt = pts[i], pts[j]
-            base = np.random.choice([BLUE_D, RED_D, GREEN_D])
-            grad = interpolate_color(base, WHITE, 0.5)
-            line = Line(src, tgt, stroke_width=0.8)
-            line.set_color_by_gradient(base, grad)
-            line.set_opacity(0.18)
-            lines.add(line)
+        edge_pairs = random_pairs(TOTAL_NODES, count=desired_edges, rng=rand.rng("edges", "pairs"), min_gap=5)
+        palette = [interpolate_color(base, WHITE, 0.25) for base in (BLUE_D, RED_D, GREEN_D)]
+        edge_colours = [palette[k] for k in rand.rng("edges", "colours").integers(0, len(palette), desired_edges)]
+        lines = EdgeBatch(pts, edge_pairs, edge_colours, opacities=0.18, widths=0.8)
         self.add(lines)
 
         # --- Camera ---
@@ -89,13 +83,8 @@ class InevitableIslandsNeuralSparse_Centered(ThreeDScene):
                 .move_to(pts[i])
                 for i in idxs
             ])
-            glow_edges = VGroup()
-            for line in lines:
-                p1, p2 = line.get_start_and_end()
-                i1 = np.argmin(np.linalg.norm(pts - p1, axis=1))
-                i2 = np.argmin(np.linalg.norm(pts - p2, axis=1))
-                if i1 in idxs and i2 in idxs:
-                    glow_edges.add(line.copy().set_color(color).set_opacity(0.5).set_stroke(width=1.5))
+            inside = np.isin(lines.pairs, idxs).all(axis=1)
+            glow_edges = lines.subset(inside).set_edge_style(color, opacities=0.5, widths=1.5)
             self.add(glow_edges)
             self.play(*[dots[i].animate.set_color(color) for i in idxs], run_time=0.6)
             self.play(FadeIn(glow_nodes, scale=1.1), run_time=0.8)
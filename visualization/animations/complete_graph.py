@@ -0,0 +1,127 @@
+from manim import *
+import os
+from math import comb
+
+from graph_mobjects import CompleteGraphPool
+from scene_rng import SceneRandom
+from ramsat import find_monochromatic_clique, monochromatic_cliques, ramsey_trace, random_colouring
+from ramsat.cliques import MAX_ENUMERATED
+
+# Shared with sat.py: solver traces for the small, exactly solvable sizes
+TRACE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "output", "sat_traces")
+
+# Largest K_n coloured by the SAT solver rather than at random
+SOLVED_EDGES = 36
+
+
+
+# ------------------------------------------------------------
+# Helpers
+# ------------------------------------------------------------
+
+
+
+def scene_settings():
+    """Sizes, clique size, seed and highlight count from the RAMSAT_* variables main.py sets."""
+    sizes = [int(v) for v in os.environ.get("RAMSAT_SIZES", "5,6").split(",") if v.strip()]
+    return (sizes,
+            int(os.environ.get("RAMSAT_CLIQUE", "3")),
+            int(os.environ.get("RAMSAT_SEED", "0")),
+            int(os.environ.get("RAMSAT_HIGHLIGHT", "2")))
+
+
+
+def monochromatic_examples(n, codes, k, limit):
+    """Up to `limit` monochromatic k-cliques as (vertices, colour code), and the total when known."""
+    if comb(n, k) <= MAX_ENUMERATED:
+        cliques, colours = monochromatic_cliques(n, codes, k)
+        return list(zip(cliques.tolist(), colours.tolist()))[:limit], len(cliques)
+    found = []
+    for colour in (1, 0):
+        clique, _ = find_monochromatic_clique(n, codes, k, colour)
+        if clique is not None:
+            found.append((list(clique), colour))
+    return found[:limit], None
+
+
+
+# ------------------------------------------------------------
+# Main Scene
+# ------------------------------------------------------------
+
+
+
+class CompleteGraphFamily(Scene):
+    """K_n for every n in RAMSAT_SIZES, with monochromatic K_k highlighted.
+
+    All sizes share one pool of vertices, labels and batched edges built
+    for the largest n, so K_40 (780 edges) renders as comfortably as K_6.
+    """
+
+    def construct(self):
+        self.camera.background_color = "#0b0b10"
+        sizes, k, seed, highlight = scene_settings()
+        rand = SceneRandom(type(self).__name__, seed)
+
+
+        title = Tex(rf"Monochromatic $K_{{{k}}}$ in red/blue $K_n$", color=YELLOW).scale(0.8).to_edge(UP)
+        self.play(Write(title))
+
+
+        pool = CompleteGraphPool(max(sizes), radius=2.6, center=0.4*DOWN,
+                                 font_size=18 if max(sizes) <= 12 else 10)
+        pool.show(sizes[0])
+        heading = Tex(rf"$K_{{{sizes[0]}}}$", color=BLUE_A).scale(0.7).next_to(title, DOWN, buff=0.15)
+        self.play(FadeIn(pool.dots), FadeIn(pool.labels), Create(pool.edges), Write(heading), run_time=1.5)
+
+
+        for n in sizes:
+            if n != pool.n:
+                new_heading = Tex(rf"$K_{{{n}}}$", color=BLUE_A).scale(0.7).move_to(heading)
+                self.play(pool.resize(n), Transform(heading, new_heading), run_time=1.5)
+
+
+            # Exact colouring from the solver when K_n is small, random otherwise
+            trace = ramsey_trace(k, k, n, TRACE_DIR) if comb(n, 2) <= SOLVED_EDGES else None
+            if trace is not None and trace["model"]:
+                codes = np.array([int(c) for c in trace["model"]], dtype=np.uint8)
+                source = "SAT solver colouring"
+            else:
+                codes = random_colouring(n, rand.rng("colouring", n))
+                source = "random colouring"
+            pool.colour_edges(codes, opacities=0.9 if n <= 12 else 0.5)
+            self.play(FadeIn(pool.edges), run_time=1.0)
+
+
+            examples, total = monochromatic_examples(n, codes, k, highlight)
+            if not examples:
+                caption = Tex(rf"{source}: no monochromatic $K_{{{k}}}$, so $R({k},{k})>{n}$", color=GREEN)
+            elif total is not None:
+                caption = Tex(rf"{source}: {total} monochromatic $K_{{{k}}}$", color=ORANGE)
+            else:
+                caption = Tex(rf"{source}: monochromatic $K_{{{k}}}$ found", color=ORANGE)
+            caption.scale(0.55).to_edge(DOWN)
+            self.play(FadeIn(caption, shift=UP))
+
+
+            for clique, colour in examples:
+                # Emphasise the clique's edges and dim the rest, on the same pooled batch
+                mask = np.zeros(len(codes), dtype=bool)
+                members = np.zeros(n, dtype=bool)
+                members[clique] = True
+                i, j = np.triu_indices(n, k=1)
+                mask[members[i] & members[j]] = True
+                pool.colour_edges(codes, opacities=np.where(mask, 1.0, 0.12), widths=np.where(mask, 5.0, 1.5))
+                clique_dots = VGroup(*[pool.dots[v] for v in clique])
+                self.play(FadeIn(pool.edges), Indicate(clique_dots, color=RED if colour else BLUE), run_time=1.0)
+                self.wait(0.4)
+            if examples:
+                pool.colour_edges(codes, opacities=0.9 if n <= 12 else 0.5)
+                self.play(FadeIn(pool.edges), run_time=0.5)
+
+
+            self.wait(0.8)
+            self.play(FadeOut(caption))
+
+
+        self.play(FadeOut(pool), FadeOut(heading), FadeOut(title))
@@ -1,6 +1,7 @@
 from manim import *
-import itertools
 import numpy as np
+from mobject_cache import text
+from ramsat import edge_list, monochromatic_cliques
 
 # ============================================================
 # Ramsey Number R(3,3)=6 Video Animation
@@ -19,7 +20,7 @@ def fixed_edge_coloring():
         (3,5),
         (4,5)
     }
-    all_edges = {tuple(sorted(e)) for e in itertools.combinations(range(6),2)}
+    all_edges = edge_list(6)
     return {e:(RED if e in REDS else BLUE) for e in all_edges}
 
 
@@ -45,7 +46,7 @@ class TwoPaneScene(Scene):
             for i,a in enumerate(VERT_POS_ANGLES)
         }
 
-        edges = list(itertools.combinations(range(6),2))
+        edges = edge_list(6)
         g = Graph(
             vertices=list(range(6)),
             edges=edges,
@@ -56,7 +57,7 @@ class TwoPaneScene(Scene):
 
         # ✅ Stronger visible labels
         for i in range(6):
-            label = Text(str(i), font_size=32, weight=BOLD)
+            label = text(str(i), font_size=32, weight=BOLD)
             label.set_stroke(BLACK, width=3, opacity=1.0)
             label.move_to(layout[i] + 0.22*UP)
             g[i].label = label
@@ -99,14 +100,10 @@ class TwoPaneScene(Scene):
 
 
     def mono_triangles(self,col):
-        out=[]
-        for a,b,c in itertools.combinations(range(6),3):
-            e1 = (min(a,b),max(a,b))
-            e2 = (min(a,c),max(a,c))
-            e3 = (min(b,c),max(b,c))
-            if col[e1]==col[e2]==col[e3]:
-                out.append((a,b,c))
-        return out
+        # pack as 1 = red, 0 = blue in edge_list order
+        codes = np.array([col[e]==RED for e in edge_list(6)],dtype=np.uint8)
+        tris,_ = monochromatic_cliques(6,codes,3)
+        return [tuple(t) for t in tris.tolist()]
 
 
     def glow_tri(self,g,tri,color=YELLOW):
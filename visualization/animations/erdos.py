@@ -1,7 +1,18 @@
 from manim import *
-import random, math
+import os
+from graph_mobjects import EdgePool, NodeCloud
+from scene_rng import SceneRandom
+from ramsat import empirical_distribution, sphere_layout
+
+# Sampled distributions are cached here as .npz, so renders never resample
+SAMPLE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "output", "erdos_samples")
 
 class ErdosProbabilisticLowerBound(ThreeDScene):
+    # X = number of monochromatic K_CLIQUE in a random colouring of K_10
+    CLIQUE = 5
+    SAMPLES = 1_000_000
+    SEED = 0
+
     def construct(self):
         # --- Setup ---
         self.camera.background_color = "#0b0b10"
@@ -17,33 +28,24 @@ class ErdosProbabilisticLowerBound(ThreeDScene):
         node_radius = 0.06
 
         # Distribute nodes on a 3D sphere (golden spiral pattern)
-        nodes = []
-        for i in range(n_nodes):
-            theta = math.acos(1 - 2 * (i + 0.5) / n_nodes)
-            phi = math.pi * (1 + 5**0.5) * i
-            x = radius * math.cos(phi) * math.sin(theta)
-            y = radius * math.sin(phi) * math.sin(theta)
-            z = radius * math.cos(theta)
-            nodes.append(np.array([x, y, z]))
-
-        # Create node spheres
-        vertices = [Sphere(center=p, radius=node_radius, color=WHITE) for p in nodes]
-        vertex_group = VGroup(*vertices)
+        nodes = sphere_layout(n_nodes, radius)
+
+        # Nodes as one point cloud rather than ten tessellated spheres
+        vertex_group = NodeCloud(nodes, WHITE, radius=node_radius)
         self.play(FadeIn(vertex_group, lag_ratio=0.1, run_time=2))
         self.wait(0.5)
 
-        # Function to generate random colored edges
-        def get_random_edges():
-            edges = []
-            for i in range(n_nodes):
-                for j in range(i + 1, n_nodes):
-                    color = random.choice([RED, BLUE])
-                    edge = Line3D(nodes[i], nodes[j], thickness=0.015, color=color).set_opacity(stroke_opacity)
-                    edges.append(edge)
-            return VGroup(*edges)
+        # Random red/blue colouring, one colour per edge of K_n; each colouring
+        # has its own keyed stream, so adding one doesn't change the others
+        rand = SceneRandom(type(self).__name__)
+
+        def get_random_colours(label):
+            pick = rand.random("colouring", label)
+            return [pick.choice([RED, BLUE]) for _ in range(n_nodes * (n_nodes - 1) // 2)]
 
         # --- Create edges and rotate the scene ---
-        edge_group = get_random_edges()
+        # The 45 Line3D meshes are built once; later colourings only recolour them
+        edge_group = EdgePool(nodes, get_random_colours("initial"), thickness=0.015, opacity=stroke_opacity)
         self.play(Create(edge_group), run_time=3)
         self.wait(0.5)
 
@@ -52,30 +54,45 @@ class ErdosProbabilisticLowerBound(ThreeDScene):
         self.begin_ambient_camera_rotation(rate=0.2)  # slow and smooth rotation
 
         # --- Slow probabilistic recolor transitions ---
-        for _ in range(6):
-            new_edges = get_random_edges()
-            self.play(Transform(edge_group, new_edges), run_time=2.5)
+        for step in range(6):
+            self.play(edge_group.recolour(get_random_colours(f"step {step}")), run_time=2.5)
         self.wait(1)
 
-        # --- Fade to "expected value" curve in 2D frame ---
+        # --- Fade to the distribution of X in 2D frame ---
         self.stop_ambient_camera_rotation()
         self.move_camera(phi=0 * DEGREES, theta=-90 * DEGREES, run_time=2)
         self.play(FadeOut(edge_group, vertex_group))
 
+        # Empirical distribution of X over SAMPLES random colourings
+        dist = empirical_distribution(n_nodes, self.CLIQUE, self.SAMPLES, self.SEED, SAMPLE_DIR)
+        probability = dist["probability"]
+        shown = max(2, int(np.flatnonzero(probability >= 1e-3)[-1]) + 1)
+        y_max = np.ceil(probability.max() * 5) / 5
+
         axes = Axes(
-            x_range=[0, 5, 1],
-            y_range=[0, 1, 0.2],
+            x_range=[-0.5, shown - 0.5, 1],
+            y_range=[0, y_max, 0.2],
             x_length=6,
             y_length=3,
             axis_config={"color": GREY_B, "stroke_width": 2},
+            x_axis_config={"numbers_to_include": range(shown)},
         ).to_edge(DOWN).shift(UP * 0.5)
 
-        curve = axes.plot(lambda x: math.exp(-((x - 2.5) ** 2) / 1.5), color=BLUE, stroke_width=4)
-        shaded = axes.get_area(curve, x_range=[3.5, 5], color=RED).set_opacity(0.4)
-        threshold_line = axes.get_vertical_line(axes.c2p(3.5, 0.3), color=YELLOW, stroke_width=3)
-        threshold_text = MathTex(r"E[X] < 1", color=YELLOW).next_to(axes, UP)
-
-        self.play(Create(axes), Create(curve), FadeIn(shaded), GrowFromCenter(threshold_line), Write(threshold_text))
+        bars = VGroup(*[
+            Polygon(axes.c2p(x - 0.35, 0), axes.c2p(x + 0.35, 0), axes.c2p(x + 0.35, p), axes.c2p(x - 0.35, p),
+                    stroke_width=0, fill_color=BLUE, fill_opacity=0.8)
+            for x, p in enumerate(probability[:shown])
+        ])
+        # Colourings that contain a monochromatic K_k
+        shaded = bars[1:].copy().set_fill(RED, opacity=0.6)
+        threshold_line = axes.get_vertical_line(axes.c2p(dist["expected"], y_max * 0.9), color=YELLOW, stroke_width=3)
+        relation = "<" if dist["expected"] < 1 else r"\ge"
+        threshold_text = MathTex(
+            rf"E[X] = \binom{{{n_nodes}}}{{{self.CLIQUE}}}\,2^{{1-\binom{{{self.CLIQUE}}}{{2}}}} \approx {dist['expected']:.2f} {relation} 1",
+            color=YELLOW,
+        ).scale(0.8).next_to(axes, UP)
+
+        self.play(Create(axes), Create(bars), FadeIn(shaded), GrowFromCenter(threshold_line), Write(threshold_text))
         self.wait(1.5)
         self.play(FadeOut(shaded, run_time=1.5))
         self.wait(0.5)
@@ -85,8 +102,8 @@ class ErdosProbabilisticLowerBound(ThreeDScene):
         self.wait(1)
 
         # --- Return to 3D: “Erdős’ Lower Bound” scene ---
-        self.play(FadeOut(axes), FadeOut(curve), FadeOut(threshold_line), FadeOut(threshold_text), FadeOut(existence_text))
-        final_edges = get_random_edges()
+        self.play(FadeOut(axes), FadeOut(bars), FadeOut(threshold_line), FadeOut(threshold_text), FadeOut(existence_text))
+        final_edges = edge_group.set_colours(get_random_colours("final"))
         self.play(FadeIn(vertex_group), Create(final_edges, lag_ratio=0.05, run_time=3))
         self.wait(0.5)
         self.begin_ambient_camera_rotation(rate=0.15)
@@ -0,0 +1,318 @@
+"""Reusable graph mobjects for the Ramsey scenes"""
+import numpy as np
+from manim import (BLUE, GRAY_D, ORIGIN, PI, RED, WHITE, Animation, Dot, Line3D, ManimColor, Mobject,
+                   PMobject, Text, VGroup, VMobject, color_to_rgba, config, interpolate_color)
+from ramsat import circular_layout, edge_list, edge_pairs
+
+
+def random_pairs(n, p=None, count=None, rng=None, min_gap=1):
+    """Random vertex pairs (i, j), i < j, as an (E, 2) array
+
+    Each pair with j - i >= min_gap is kept with probability p, or exactly
+    `count` of them are drawn without replacement.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    i, j = np.triu_indices(n, k=min_gap)
+    if count is not None:
+        keep = np.sort(rng.choice(len(i), size=count, replace=False))
+    else:
+        keep = np.flatnonzero(rng.random(len(i)) < p)
+    return np.column_stack((i[keep], j[keep]))
+
+
+def segment_points(starts, ends):
+    """Cubic Bezier control points of straight segments, shape (E * 4, 3)"""
+    starts = np.asarray(starts, dtype=float)
+    ends = np.asarray(ends, dtype=float)
+    delta = ends - starts
+    return np.stack((starts, starts + delta / 3, starts + 2 * delta / 3, ends), axis=1).reshape(-1, 3)
+
+
+class EdgePool(VGroup):
+    """Every edge of a complete graph, built once and recoloured in place
+
+    Edges are indexed by vertex pair (i, j) with i < j, in ramsat.edge_list
+    (packed colouring) order. Recolouring only changes fill/stroke colours, so
+    the meshes of Line3D edges are never rebuilt or interpolated.
+    """
+
+    def __init__(self, points, colours=None, line_class=Line3D, opacity=1.0, **line_kwargs):
+        self.pairs = edge_list(len(points))
+        edges = [line_class(points[i], points[j], **line_kwargs) for i, j in self.pairs]
+        super().__init__(*edges)
+        self.edge_opacity = opacity
+        self.set_opacity(opacity)
+        if colours is not None:
+            self.set_colours(colours)
+
+    def edge(self, i, j):
+        """The edge between vertices i and j"""
+        i, j = min(i, j), max(i, j)
+        return self.submobjects[self.pairs.index((i, j))]
+
+    def set_colours(self, colours):
+        """Colour each edge at once (one colour per pair, combinations order)"""
+        for edge, colour in zip(self.submobjects, colours):
+            edge.set_color(colour)
+        return self
+
+    def recolour(self, colours, **kwargs):
+        """Animation fading every edge from its current colour to the new one"""
+        return RecolourEdges(self, colours, **kwargs)
+
+
+class EdgeBatch(VGroup):
+    """Many straight edges drawn as one VMobject per distinct stroke style
+
+    Cairo pays a fixed cost per mobject, so hundreds of Line objects are
+    much slower than a few VMobjects holding the same segments as
+    sub-paths. Colours, opacities and widths are kept per edge; edges that
+    share a style are batched into the same VMobject, and edges with zero
+    opacity are left out.
+    """
+
+    def __init__(self, points, pairs, colours="#FFFFFF", opacities=1.0, widths=1.0):
+        super().__init__()
+        self.node_points = np.asarray(points, dtype=float)
+        self.pairs = np.asarray(pairs, dtype=int).reshape(-1, 2)
+        self.set_edge_style(colours, opacities, widths)
+
+    def _rebuild(self):
+        segments = segment_points(self.node_points[self.pairs[:, 0]], self.node_points[self.pairs[:, 1]])
+        segments = segments.reshape(-1, 4, 3)
+        styles = [f"{c}|{o}|{w}" for c, o, w in zip(self.colours, self.opacities, self.widths)]
+        keys, inverse = np.unique(np.array(styles, dtype=str), return_inverse=True)
+        visible = self.opacities > 0
+        batches = []
+        self.batch_indices = []
+        for k in range(len(keys)):
+            idx = np.flatnonzero((inverse == k) & visible)
+            if not len(idx):
+                continue
+            batch = VMobject(stroke_color=self.colours[idx[0]], stroke_opacity=self.opacities[idx[0]],
+                             stroke_width=self.widths[idx[0]], fill_opacity=0)
+            batch.set_points(segments[idx].reshape(-1, 3))
+            batches.append(batch)
+            self.batch_indices.append(idx)
+        self.submobjects = batches
+        return self
+
+    def set_node_points(self, points):
+        """Move the nodes, updating segments in place (styles and batches are kept)"""
+        self.node_points = np.asarray(points, dtype=float)
+        segments = segment_points(self.node_points[self.pairs[:, 0]], self.node_points[self.pairs[:, 1]])
+        segments = segments.reshape(-1, 4, 3)
+        for batch, idx in zip(self.submobjects, self.batch_indices):
+            batch.set_points(segments[idx].reshape(-1, 3))
+        return self
+
+    def set_edge_style(self, colours=None, opacities=None, widths=None):
+        """Change per-edge styles (scalars apply to every edge) and re-batch
+
+        Segments are regenerated from the node points, so restyle before
+        moving the batch.
+        """
+        count = len(self.pairs)
+        if colours is not None:
+            if isinstance(colours, (list, tuple, np.ndarray)):
+                self.colours = np.array([ManimColor(c).to_hex() for c in colours], dtype=object)
+            else:
+                self.colours = np.array([ManimColor(colours).to_hex()] * count, dtype=object)
+        if opacities is not None:
+            self.opacities = np.broadcast_to(np.asarray(opacities, dtype=float), (count,)).copy()
+        if widths is not None:
+            self.widths = np.broadcast_to(np.asarray(widths, dtype=float), (count,)).copy()
+        return self._rebuild()
+
+    def subset(self, mask):
+        """A new batch holding only the selected edges (boolean mask or indices)"""
+        return EdgeBatch(self.node_points, self.pairs[mask], list(self.colours[mask]),
+                         self.opacities[mask], self.widths[mask])
+
+
+class NodeCloud(PMobject):
+    """All vertices of a 3D graph as one point cloud driven by an (N, 3) array
+
+    A Sphere or Dot3D node is a tessellated mesh that the 3D camera sorts
+    and shades face by face, although it ends up a few pixels wide. Here
+    every vertex is one camera-facing square of about 2 * radius, so a
+    camera move re-projects a single array. PMobjects can't go in a
+    VGroup; combine with edges using Group.
+    """
+
+    def __init__(self, positions, colours=WHITE, radius=0.05, opacity=1.0, **kwargs):
+        # PMobject stroke_width is a size in pixels; match the dot diameter
+        pixels_per_unit = config.pixel_width / config.frame_width
+        super().__init__(stroke_width=max(1, round(2 * radius * pixels_per_unit)), **kwargs)
+        positions = np.asarray(positions, dtype=float).reshape(-1, 3)
+        self.add_points(positions)
+        self.set_node_colours(colours, opacity)
+
+    def get_positions(self):
+        return self.points
+
+    def set_positions(self, positions):
+        """Move every vertex at once (keeps colours)"""
+        self.points = np.asarray(positions, dtype=float).reshape(-1, 3)
+        return self
+
+    def set_node_colours(self, colours, opacity=1.0):
+        """One colour for all vertices or one per vertex"""
+        if isinstance(colours, (list, tuple, np.ndarray)):
+            rgbas = np.array([color_to_rgba(colour, opacity) for colour in colours])
+        else:
+            rgbas = np.tile(color_to_rgba(colours, opacity), (len(self.points), 1))
+        self.rgbas = rgbas
+        return self
+
+    def set_opacity(self, opacity, family=True):
+        """Same alpha for every vertex"""
+        self.rgbas[:, 3] = opacity
+        return self
+
+    def fade(self, darkness=0.5, family=True):
+        """Scale the alpha of every vertex by 1 - darkness, as VMobject.fade does
+
+        PMobject has no opacity handling of its own, so without this
+        FadeIn/FadeOut would pop the vertices in and out.
+        """
+        self.rgbas[:, 3] *= 1 - darkness
+        return self
+
+
+class RecolourEdges(Animation):
+    """Interpolate edge colours only; no mobject copy, no point interpolation"""
+
+    def __init__(self, pool, colours, **kwargs):
+        self.end_colours = list(colours)
+        self.start_colours = []
+        super().__init__(pool, **kwargs)
+
+    def create_starting_mobject(self):
+        # Animation.begin() would otherwise deep-copy every edge mesh
+        return Mobject()
+
+    def begin(self):
+        self.start_colours = [edge.get_color() for edge in self.mobject.submobjects]
+        super().begin()
+
+    def interpolate_mobject(self, alpha):
+        t = self.rate_func(alpha)
+        for edge, start, end in zip(self.mobject.submobjects, self.start_colours, self.end_colours):
+            edge.set_color(interpolate_color(start, end, t))
+
+
+class CompleteGraphPool(VGroup):
+    """Vertices, labels and edges of K_max_n, built once and reused for any K_n, n <= max_n
+
+    Going from one K_n to another moves the pooled dots and labels and
+    restyles the edge batch, instead of fading a graph out and building
+    the next one. Vertices n.. are parked, invisible, at the centre; the
+    edges of K_n are the pool edges (i, j) with j < n, in packed order.
+    """
+
+    def __init__(self, max_n, radius=3.0, center=ORIGIN, dot_radius=0.06, font_size=18):
+        super().__init__()
+        self.max_n = max_n
+        self.radius = radius
+        self.center = np.asarray(center, dtype=float)
+        self.n = max_n
+        positions = self.layout(max_n)
+        self.dots = VGroup(*[Dot(point, radius=dot_radius, color=WHITE) for point in positions])
+        self.labels = VGroup(*[Text(str(i + 1), font_size=font_size) for i in range(max_n)])
+        i, j = edge_pairs(max_n)
+        self.edges = EdgeBatch(positions, np.column_stack((i, j)), GRAY_D, widths=1.5)
+        self.add(self.edges, self.dots, self.labels)
+        self.place(positions)
+
+    def layout(self, n):
+        """Node positions for K_n: a circle for the first n, the centre for the rest"""
+        positions = np.tile(self.center, (self.max_n, 1))
+        positions[:n] = circular_layout(n, self.radius, start_angle=PI / 2, center=self.center)
+        return positions
+
+    def edge_mask(self, n):
+        """Which pool edges belong to K_n"""
+        return edge_pairs(self.max_n)[1] < n
+
+    def node_positions(self):
+        return np.array([dot.get_center() for dot in self.dots])
+
+    def place(self, positions):
+        """Put every dot, label and edge end at the given (max_n, 3) positions"""
+        for dot, label, point in zip(self.dots, self.labels, positions):
+            dot.move_to(point)
+            offset = point - self.center
+            norm = np.linalg.norm(offset)
+            label.move_to(point + (0.25 * offset / norm if norm > 1e-6 else 0))
+        self.edges.set_node_points(positions)
+        return self
+
+    def show(self, n, colours=GRAY_D, widths=1.5):
+        """Switch to K_n at once: vertices >= n hidden, K_n edges drawn in `colours`"""
+        self.n = n
+        for k, (dot, label) in enumerate(zip(self.dots, self.labels)):
+            dot.set_opacity(1.0 if k < n else 0.0)
+            label.set_opacity(1.0 if k < n else 0.0)
+        self.set_edges(colours, widths=widths)
+        return self.place(self.layout(n))
+
+    def set_edges(self, colours, opacities=1.0, widths=1.5):
+        """Style the edges of the current K_n (per edge in packed order, or one for all)"""
+        mask = self.edge_mask(self.n)
+        count = len(mask)
+        if isinstance(colours, (list, tuple, np.ndarray)):
+            full = np.array([GRAY_D] * count, dtype=object)
+            full[mask] = list(colours)
+        else:
+            full = [colours] * count
+        full_opacity = np.zeros(count)
+        full_opacity[mask] = opacities
+        full_widths = np.full(count, 1.5)
+        full_widths[mask] = widths
+        self.edges.set_edge_style(list(full), full_opacity, full_widths)
+        return self
+
+    def colour_edges(self, codes, opacities=1.0, widths=1.5):
+        """Colour K_n from a packed colouring (1 = red, 0 = blue)"""
+        return self.set_edges([RED if code else BLUE for code in codes], opacities, widths)
+
+    def resize(self, n, **kwargs):
+        """Animation moving the pool from its current K_n to K_n for the new n"""
+        return ResizeCompleteGraph(self, n, **kwargs)
+
+
+class ResizeCompleteGraph(Animation):
+    """Slide pooled vertices between layouts; the edges follow their end points"""
+
+    def __init__(self, pool, n, **kwargs):
+        self.target_n = n
+        self.start_positions = None
+        self.end_positions = None
+        super().__init__(pool, **kwargs)
+
+    def create_starting_mobject(self):
+        # nothing to interpolate from but the node positions
+        return Mobject()
+
+    def begin(self):
+        pool = self.mobject
+        self.start_positions = pool.node_positions()
+        self.end_positions = pool.layout(self.target_n)
+        # new vertices grow out of the centre; edges of K_n show up grey
+        grow = max(pool.n, self.target_n)
+        for k, (dot, label) in enumerate(zip(pool.dots, pool.labels)):
+            dot.set_opacity(1.0 if k < grow else 0.0)
+            label.set_opacity(1.0 if k < grow else 0.0)
+        pool.n = self.target_n
+        pool.set_edges(GRAY_D)
+        pool.place(self.start_positions)
+        super().begin()
+
+    def interpolate_mobject(self, alpha):
+        t = self.rate_func(alpha)
+        self.mobject.place(self.start_positions + (self.end_positions - self.start_positions) * t)
+
+    def finish(self):
+        super().finish()
+        self.mobject.show(self.target_n)
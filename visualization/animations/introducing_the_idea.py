@@ -1,5 +1,5 @@
 from manim import *
-import itertools
+from ramsat import edge_list
 
 class RamseyIntro(Scene):
     def construct(self):
@@ -25,7 +25,7 @@ class RamseyIntro(Scene):
         BLUE_CLIQUE = [(3,4),(4,5),(3,5)]
         edges = VGroup()
 
-        for i, j in itertools.combinations(range(len(points)), 2):
+        for i, j in edge_list(len(points)):
             if (i, j) in RED_CLIQUE or (j, i) in RED_CLIQUE:
                 col = RED
             elif (i, j) in BLUE_CLIQUE or (j, i) in BLUE_CLIQUE:
@@ -0,0 +1,49 @@
+"""Build each distinct label mobject once per process and hand out copies
+
+Tex and Text are expensive to construct even when their SVG is already
+cached on disk: the file is parsed again and every glyph path rebuilt.
+Vertex labels repeat the same few strings for each graph a scene draws,
+so tex()/text() keep one template per (class, arguments) and return a
+copy(), which only duplicates point arrays.
+
+    labels = VGroup(*[tex(str(i + 1)).scale(0.45) for i in range(6)])
+
+Templates must not be changed in place; callers always get their own copy.
+"""
+from manim import MathTex, Tex, Text
+
+_templates = {}
+
+
+def _key(cls, args, kwargs):
+    return (cls.__name__, args, tuple(sorted((name, repr(value)) for name, value in kwargs.items())))
+
+
+def cached(cls, *args, **kwargs):
+    """A copy of cls(*args, **kwargs), constructing it only the first time"""
+    key = _key(cls, args, kwargs)
+    template = _templates.get(key)
+    if template is None:
+        template = _templates[key] = cls(*args, **kwargs)
+    return template.copy()
+
+
+def tex(*args, **kwargs):
+    return cached(Tex, *args, **kwargs)
+
+
+def math_tex(*args, **kwargs):
+    return cached(MathTex, *args, **kwargs)
+
+
+def text(*args, **kwargs):
+    return cached(Text, *args, **kwargs)
+
+
+def cache_size():
+    """Number of distinct templates built so far"""
+    return len(_templates)
+
+
+def clear():
+    _templates.clear()
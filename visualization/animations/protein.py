@@ -1,6 +1,8 @@
 from manim import *
 import numpy as np
-import random
+from graph_mobjects import EdgeBatch, NodeCloud, random_pairs
+from scene_rng import SceneRandom
+from ramsat import circular_layout
 
 class Sparse3DGraphRamsey(ThreeDScene):
     def construct(self):
@@ -19,46 +21,28 @@ class Sparse3DGraphRamsey(ThreeDScene):
         N = 70
         num_edges = 100       # ↓ fewer edges for faster render
         radius = 3.0
-        random.seed(42)
-        np.random.seed(42)
+        rand = SceneRandom(type(self).__name__, seed=42)
 
         # -------- Node positions (vectorized) --------
-        angles = np.linspace(0, 2 * np.pi, N, endpoint=False)
-        base_circle = np.column_stack((
-            radius * np.cos(angles),
-            radius * np.sin(angles),
-            np.zeros(N)
-        ))
-        jitter = np.random.uniform(-0.7, 0.7, (N, 3))
+        base_circle = circular_layout(N, radius)
+        jitter = rand.rng("layout", "jitter").uniform(-0.7, 0.7, (N, 3))
         points = base_circle + jitter
 
         # -------- Edge generation --------
-        edges = set()
-        while len(edges) < num_edges:
-            i, j = random.sample(range(N), 2)
-            if i != j:
-                edges.add(tuple(sorted((i, j))))
-        edges = list(edges)
+        edges = random_pairs(N, count=num_edges, rng=rand.rng("edges"))
 
         red_levels = [RED_E, RED_C, RED_A]
         green_color = "#00FF88"
-        green_edges = {
-            e for e in edges if (abs(e[0] - e[1]) % 7 == 0 or abs(e[0] - e[1]) % 11 == 0)
-        }
+        gap = np.abs(edges[:, 0] - edges[:, 1])
+        green = (gap % 7 == 0) | (gap % 11 == 0)
 
         # -------- Graph construction --------
-        # Vectorized loops → single creation pass
-        edge_objs = [
-            Line(
-                points[i], points[j],
-                color=(green_color if (i, j) in green_edges else red_levels[k % 3]),
-                stroke_width=(1.8 if (i, j) in green_edges else 1.0)
-            )
-            for k, (i, j) in enumerate(edges)
-        ]
-        node_objs = [Dot3D(p, radius=0.03, color=WHITE) for p in points]
+        # All 100 edges in one EdgeBatch (a VMobject per colour/width)
+        edge_colours = [green_color if g else red_levels[k % 3] for k, g in enumerate(green)]
+        edge_objs = EdgeBatch(points, edges, edge_colours, widths=np.where(green, 1.8, 1.0))
+        node_objs = NodeCloud(points, WHITE, radius=0.03)
 
-        ramsey_graph = VGroup(*edge_objs, *node_objs)
+        ramsey_graph = Group(edge_objs, node_objs)
         self.add(ramsey_graph)
 
         # -------- 1. Rotate graph --------
@@ -77,13 +61,10 @@ class Sparse3DGraphRamsey(ThreeDScene):
         protein_points = np.column_stack((x, y, z))
 
         red_levels = [RED_E, RED_C, RED_A]
-        edges2 = [
-            Line(protein_points[i], protein_points[i + 1],
-                 color=red_levels[i % 3], stroke_width=1.2)
-            for i in range(N - 1)
-        ]
-        nodes2 = [Dot3D(p, radius=0.03, color=WHITE) for p in protein_points]
-        protein_graph = VGroup(*edges2, *nodes2).shift(RIGHT * 2.5)
+        chain = np.column_stack((np.arange(N - 1), np.arange(1, N)))
+        edges2 = EdgeBatch(protein_points, chain, [red_levels[i % 3] for i in range(N - 1)], widths=1.2)
+        nodes2 = NodeCloud(protein_points, WHITE, radius=0.03)
+        protein_graph = Group(edges2, nodes2).shift(RIGHT * 2.5)
 
         # Fade in protein
         self.play(
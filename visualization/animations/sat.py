@@ -1,7 +1,11 @@
 from manim import *
-import itertools
-import math
-import random
+import os
+
+from mobject_cache import tex
+from ramsat import circular_layout, edge_key, edge_list, ramsey_trace
+
+# Solver traces are cached here, so renders replay them instead of solving
+TRACE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "output", "sat_traces")
 
 
 
@@ -11,34 +15,24 @@ import random
 
 
 
-def circular_layout(n, radius=3.0, start_angle=PI/2):
-    """Return n points on a circle (for K_n)."""
-    return [
-        radius * np.array([
-            math.cos(start_angle + 2 * math.pi * i / n),
-            math.sin(start_angle + 2 * math.pi * i / n),
-            0,
-        ])
-        for i in range(n)
-    ]
-
-
-
-def complete_graph_edges(vertices):
-    """All undirected edges (i<j) from list of Dot mobjects."""
-    idx_pairs = list(itertools.combinations(range(len(vertices)), 2))
-    return idx_pairs
+def code_colour(code):
+    """Edge colour for one character of a trace assignment ("1" red, "0" blue, "." unset)."""
+    return {"1": RED, "0": BLUE}.get(code, GRAY_D)
 
 
 
-def edge_key(i, j):
-    return (i, j) if i < j else (j, i)
+def variable_name(n, var):
+    """Console name of SAT variable var (1-based) of K_n, e.g. x_12."""
+    i, j = edge_list(n)[var - 1]
+    return f"x_{i+1}{j+1}" if n < 10 else f"x_{i+1},{j+1}"
 
 
 
-def clique_indices(n, k):
-    """All k-cliques by index (combinations of k distinct vertices)."""
-    return list(itertools.combinations(range(n), k))
+def conflict_clique(event):
+    """(edge pairs, colour) of the clique a conflict event found monochromatic."""
+    clique, colour = event[3], event[4]
+    pairs = [(a, b) for k, a in enumerate(clique) for b in clique[k+1:]]
+    return pairs, RED if colour == 1 else BLUE
 
 
 
@@ -49,8 +43,15 @@ def clique_indices(n, k):
 
 
 class SATRamseyVerification(Scene):
+    # Ramsey instance: colourings of K_N with no red K_S and no blue K_T
+    S, T, N = 3, 3, 6
+
     def construct(self):
         self.camera.background_color = "#0b0b10"
+        s, t = self.S, self.T
+        trace = ramsey_trace(s, t, self.N, TRACE_DIR)
+        below = ramsey_trace(s, t, self.N - 1, TRACE_DIR)
+        conflicts = [e for e in trace["events"] if e[0] == "c" and e[3]]
 
 
         title = Tex(r"SAT-Based Computational Verification of Ramsey Numbers", color=YELLOW).scale(0.7)
@@ -83,11 +84,11 @@ class SATRamseyVerification(Scene):
         # --------------------------------------------------------
         # Build K_n with n=6
         # --------------------------------------------------------
-        n = 6
-        vertex_positions = circular_layout(n, radius=1.8)
+        n = self.N
+        vertex_positions = circular_layout(n, radius=1.8, start_angle=PI/2)
         vertices = VGroup(*[Dot(pos, radius=0.07, color=WHITE) for pos in vertex_positions])
         labels = VGroup(*[
-            Tex(str(i+1)).scale(0.45).next_to(vertices[i], 0.35*OUT + 0.35*RIGHT if vertex_positions[i][0] >= 0 else 0.35*OUT + 0.35*LEFT)
+            tex(str(i+1)).scale(0.45).next_to(vertices[i], 0.35*OUT + 0.35*RIGHT if vertex_positions[i][0] >= 0 else 0.35*OUT + 0.35*LEFT)
             for i in range(n)
         ])
         graph_group = VGroup(vertices, labels).move_to(left_panel.get_center()).shift(0.2*DOWN)
@@ -98,7 +99,7 @@ class SATRamseyVerification(Scene):
 
 
         # Edges
-        idx_pairs = complete_graph_edges(vertices)
+        idx_pairs = edge_list(n)
         edges = {}
         edge_lines = VGroup()
         for (i, j) in idx_pairs:
@@ -152,13 +153,15 @@ class SATRamseyVerification(Scene):
 
 
         # FIXED: Console lines properly formatted and positioned
+        instance, stats = trace["instance"], trace["stats"]
+        first = next((e for e in trace["events"] if e[0] == "d"), None)
         console_lines_text = [
-            "encode(K_6) -> 40 vars",
-            "propagate() -> search",
-            "branch() -> x_12=1",
-            "conflict() -> back",
-            "propagate() -> fail",
-            "UNSAT"
+            f"encode(K_{n}) -> {instance['vars']} vars, {instance['clauses']} clauses",
+            f"branch() -> {variable_name(n, first[2])}={first[3]}" if first else "branch() -> none",
+            f"propagate() -> {stats['propagations']} implied",
+            f"conflict() x{stats['conflicts']} -> back",
+            f"decisions: {stats['decisions']}",
+            trace["result"]
         ]
         console_lines = VGroup(*[Text(t, font_size=13, color=GRAY_B, font="Monospace") for t in console_lines_text])
         
@@ -172,53 +175,32 @@ class SATRamseyVerification(Scene):
             self.play(FadeIn(line, target_position=line.get_center()+0.03*UP), run_time=0.2)
         
         unsat_line = console_lines[-1]
-        unsat_line.set_color(RED)
-        self.play(FadeIn(unsat_line, scale=1.05), Flash(unsat_line, color=RED, flash_radius=0.5))
+        result_color = RED if trace["result"] == "UNSAT" else GREEN
+        unsat_line.set_color(result_color)
+        self.play(FadeIn(unsat_line, scale=1.05), Flash(unsat_line, color=result_color, flash_radius=0.5))
         self.wait(0.3)
 
 
         # --------------------------------------------------------
         # Visual link: edge coloring
         # --------------------------------------------------------
-        random.seed(7)
-        assignment = {}
-        for (i, j) in idx_pairs:
-            assignment[edge_key(i, j)] = random.choice([0, 1])
-
-
+        # Partial assignment at the solver's first conflict (or its model)
+        assigned = conflicts[0][5] if conflicts else trace["model"] or "." * len(idx_pairs)
         anims = []
-        for (i, j) in idx_pairs:
-            color = RED if assignment[edge_key(i, j)] == 1 else BLUE
-            anims.append(edges[edge_key(i, j)].animate.set_color(color))
+        for (i, j), code in zip(idx_pairs, assigned):
+            anims.append(edges[(i, j)].animate.set_color(code_colour(code)))
         self.play(LaggedStart(*anims, lag_ratio=0.01), run_time=0.8)
 
 
-        tri_cliques = clique_indices(n, 3)
-        tri_found = None
-        for (a, b, c) in tri_cliques:
-            colors = [
-                RED if assignment[edge_key(a, b)] else BLUE,
-                RED if assignment[edge_key(b, c)] else BLUE,
-                RED if assignment[edge_key(a, c)] else BLUE,
-            ]
-            if colors[0] == colors[1] == colors[2]:
-                tri_found = (a, b, c, colors[0])
-                break
-
-
-        if tri_found is not None:
-            a, b, c, mono_color = tri_found
-            tri_edges = VGroup(
-                edges[edge_key(a, b)],
-                edges[edge_key(b, c)],
-                edges[edge_key(a, c)],
-            )
+        if conflicts:
+            clique_pairs, mono_color = conflict_clique(conflicts[0])
+            tri_edges = VGroup(*[edges[pair] for pair in clique_pairs])
             halo = SurroundingRectangle(tri_edges, color=mono_color, buff=0.15, corner_radius=0.1)
             self.play(Create(halo), Indicate(tri_edges, color=mono_color))
             
             # FIXED: Position text BELOW left panel to avoid overlap
             forbid_text = Tex(
-                r"Forbidden mono $K_3$ found",
+                rf"Forbidden mono $K_{len(conflicts[0][3])}$ found",
                 color=mono_color
             ).scale(0.5)
             forbid_text.next_to(left_panel, DOWN, buff=0.2)
@@ -243,31 +225,36 @@ class SATRamseyVerification(Scene):
         # --------------------------------------------------------
         # FIXED: Demonstrate R(3,3) = 6 - properly positioned below panels with reduced sizes
         # --------------------------------------------------------
-        r33 = Tex(r"$R(3,3)=6$", color=YELLOW).scale(0.52)
+        if trace["result"] == "UNSAT" and below["result"] == "SAT":
+            r33 = Tex(rf"$R({s},{t})={n}$", color=YELLOW).scale(0.52)
+        elif trace["result"] == "UNSAT":
+            r33 = Tex(rf"$R({s},{t})\le {n}$", color=YELLOW).scale(0.52)
+        else:
+            r33 = Tex(rf"$R({s},{t})>{n}$", color=YELLOW).scale(0.52)
         r33.next_to(left_panel, DOWN, buff=0.15)
         self.play(Write(r33))
         self.wait(0.2)
 
 
-        n5_note = Tex(r"$n=5$: SAT", color=GREEN).scale(0.42)
+        n5_note = Tex(rf"$n={n-1}$: {below['result']}", color=GREEN if below["result"] == "SAT" else RED).scale(0.42)
         n5_note.next_to(r33, DOWN, buff=0.1)
         self.play(Write(n5_note))
 
 
         # Temporarily show K5
         self.play(FadeOut(edge_lines), FadeOut(vertices), FadeOut(labels))
-        n5 = 5
-        pos5 = circular_layout(n5, radius=1.8)
+        n5 = n - 1
+        pos5 = circular_layout(n5, radius=1.8, start_angle=PI/2)
         vertices5 = VGroup(*[Dot(pos, radius=0.07, color=WHITE) for pos in pos5])
         labels5 = VGroup(*[
-            Tex(str(i+1)).scale(0.45).next_to(vertices5[i], 0.35*OUT + 0.35*RIGHT if pos5[i][0] >= 0 else 0.35*OUT + 0.35*LEFT)
+            tex(str(i+1)).scale(0.45).next_to(vertices5[i], 0.35*OUT + 0.35*RIGHT if pos5[i][0] >= 0 else 0.35*OUT + 0.35*LEFT)
             for i in range(n5)
         ])
         vg5 = VGroup(vertices5, labels5).move_to(left_panel.get_center()).shift(0.2*DOWN)
         self.play(FadeIn(vertices5, labels5, shift=0.2*UP))
 
 
-        idx5 = list(itertools.combinations(range(n5), 2))
+        idx5 = edge_list(n5)
         edges5 = {}
         lines5 = VGroup()
         for (i, j) in idx5:
@@ -277,18 +264,15 @@ class SATRamseyVerification(Scene):
         self.play(LaggedStart(*[Create(line) for line in lines5], lag_ratio=0.02))
 
 
-        cycle = [(0,1),(1,2),(2,3),(3,4),(4,0)]
-        for (i, j) in idx5:
-            if edge_key(i, j) in [edge_key(*p) for p in cycle]:
-                edges5[edge_key(i, j)].set_color(RED)
-            else:
-                edges5[edge_key(i, j)].set_color(BLUE)
+        # The solver's model for n - 1: no forbidden clique in either colour
+        for (i, j), code in zip(idx5, below["model"] or "." * len(idx5)):
+            edges5[(i, j)].set_color(code_colour(code))
         self.play(*[edges5[e].animate.set_stroke(width=2.8) for e in edges5])
         self.wait(0.5)
 
 
         # FIXED: Position n=6 note properly below n=5 note with reduced size
-        n6_note = Tex(r"$n=6$: UNSAT", color=RED).scale(0.42)
+        n6_note = Tex(rf"$n={n}$: {trace['result']}", color=RED if trace["result"] == "UNSAT" else GREEN).scale(0.42)
         n6_note.next_to(n5_note, DOWN, buff=0.1)
         
         self.play(Write(n6_note))
@@ -299,64 +283,34 @@ class SATRamseyVerification(Scene):
         self.play(FadeOut(lines5), FadeOut(vertices5), FadeOut(labels5))
 
 
-        vertices = VGroup(*[Dot(pos, radius=0.07, color=WHITE) for pos in vertex_positions])
-        labels = VGroup(*[
-            Tex(str(i+1)).scale(0.45).next_to(vertices[i], 0.35*OUT + 0.35*RIGHT if vertex_positions[i][0] >= 0 else 0.35*OUT + 0.35*LEFT)
-            for i in range(n)
-        ])
-        VGroup(vertices, labels).move_to(left_panel.get_center()).shift(0.2*DOWN)
+        # FadeOut leaves mobjects intact, so the first K6 is reused rather than rebuilt
         self.play(FadeIn(vertices, labels, shift=0.1*UP))
 
 
-        edges = {}
-        edge_lines = VGroup()
-        for (i, j) in idx_pairs:
-            line = Line(vertices[i].get_center(), vertices[j].get_center(), stroke_width=2.0, color=GRAY_D, z_index=-1)
-            edges[edge_key(i, j)] = line
-            edge_lines.add(line)
+        edge_lines.set_color(GRAY_D)
         self.play(LaggedStart(*[Create(l) for l in edge_lines], lag_ratio=0.02))
 
 
-        attempts = 2
-        for attempt_num in range(attempts):
-            assignment = {}
-            for (i, j) in idx_pairs:
-                assignment[edge_key(i, j)] = random.choice([0, 1])
+        # Replay the next conflicts from the trace
+        for event in conflicts[1:3]:
             self.play(*[
-                edges[edge_key(i, j)].animate.set_color(RED if assignment[edge_key(i, j)] else BLUE)
-                for (i, j) in idx_pairs
+                edges[(i, j)].animate.set_color(code_colour(code))
+                for (i, j), code in zip(idx_pairs, event[5])
             ], run_time=0.6)
 
 
-            tri_found = None
-            for (a, b, c) in tri_cliques:
-                colors = [
-                    RED if assignment[edge_key(a, b)] else BLUE,
-                    RED if assignment[edge_key(b, c)] else BLUE,
-                    RED if assignment[edge_key(a, c)] else BLUE,
-                ]
-                if colors[0] == colors[1] == colors[2]:
-                    tri_found = (a, b, c, colors[0])
-                    break
-
-
-            if tri_found is not None:
-                a, b, c, mono_color = tri_found
-                tri_edges = VGroup(
-                    edges[edge_key(a, b)],
-                    edges[edge_key(b, c)],
-                    edges[edge_key(a, c)],
-                )
-                self.play(Indicate(tri_edges, color=mono_color), Flash(tri_edges[0], color=mono_color, flash_radius=0.3))
-                self.wait(0.15)
+            clique_pairs, mono_color = conflict_clique(event)
+            tri_edges = VGroup(*[edges[pair] for pair in clique_pairs])
+            self.play(Indicate(tri_edges, color=mono_color), Flash(tri_edges[0], color=mono_color, flash_radius=0.3))
+            self.wait(0.15)
 
 
         # Final statement
         self.play(FadeOut(n5_note), FadeOut(n6_note))
         
         final_text = Tex(
-            r"In any 6 people: 3 friends \\",
-            r"\emph{or} 3 strangers",
+            rf"In any {n} people: {s} friends \\",
+            rf"\emph{{or}} {t} strangers",
             color=YELLOW
         ).scale(0.48)
         final_text.next_to(left_panel, DOWN, buff=0.15)
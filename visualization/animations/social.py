@@ -1,5 +1,7 @@
 from manim import *
-import itertools, random, numpy as np
+import numpy as np
+from graph_mobjects import EdgeBatch, random_pairs
+from scene_rng import SceneRandom
 
 class RamseyInNeuralNets(Scene):
     def construct(self):
@@ -10,25 +12,22 @@ class RamseyInNeuralNets(Scene):
         self.wait(1)
 
         N = 20
-        random.seed(2)
+        # One random stream per section, so editing one leaves the others' draws alone
+        rand = SceneRandom(type(self).__name__, seed=2)
 
         # Initial random positions
-        positions = [np.array([random.uniform(-5, 5), random.uniform(-2, 2), 0]) for _ in range(N)]
+        layout = rand.random("layout")
+        positions = [np.array([layout.uniform(-5, 5), layout.uniform(-2, 2), 0]) for _ in range(N)]
         nodes = [Dot(pos, radius=0.12, color=GREY_B) for pos in positions]
         node_group = VGroup(*nodes)
 
         self.play(FadeIn(node_group))
         self.wait(0.5)
 
-        # Random edges (random weight init)
-        edges = []
-        for i, j in itertools.combinations(range(N), 2):
-            if random.random() < 0.12:
-                line = Line(nodes[i].get_center(), nodes[j].get_center(), stroke_opacity=0.5)
-                edges.append(line)
-
-        edge_group = VGroup(*edges)
-        self.play(LaggedStartMap(Create, edge_group, lag_ratio=0.01), run_time=2)
+        # Random edges (random weight init), drawn as one batched VMobject
+        edge_group = EdgeBatch(positions, random_pairs(N, p=0.12, rng=rand.rng("edges")), WHITE, opacities=0.5,
+                               widths=DEFAULT_STROKE_WIDTH)
+        self.play(Create(edge_group), run_time=2)
         self.wait(0.5)
 
         # Caption 1
@@ -37,7 +36,7 @@ class RamseyInNeuralNets(Scene):
         self.wait(1.5)
 
         # Highlight a "structured" subgraph (sample)
-        sample_nodes = random.sample(range(N), 5)
+        sample_nodes = rand.random("highlight").sample(range(N), 5)
         highlights = VGroup(*[nodes[i].copy().set_color(YELLOW).scale(1.5) for i in sample_nodes])
         self.play(FadeIn(highlights))
         self.wait(0.8)
@@ -70,19 +69,16 @@ class RamseyInNeuralNets(Scene):
         self.play(FadeOut(edge_group, shift=DOWN * 0.2))
 
         # Create edges between layers (feedforward look)
-        new_edges = []
-        for i in range(N):
-            for j in range(N):
-                li, lj = i % 4, j % 4
-                if lj == li + 1 and random.random() < 0.4:
-                    new_edges.append(Line(nodes[i].get_center(), nodes[j].get_center(), stroke_opacity=0.5))
-        new_edge_group = VGroup(*new_edges)
-        self.play(LaggedStartMap(Create, new_edge_group, lag_ratio=0.02), run_time=2)
+        layer = np.arange(N) % 4
+        feedforward = (layer[None, :] == layer[:, None] + 1) & (rand.rng("feedforward").random((N, N)) < 0.4)
+        new_edge_group = EdgeBatch(new_positions, np.argwhere(feedforward), WHITE, opacities=0.5,
+                                   widths=DEFAULT_STROKE_WIDTH)
+        self.play(Create(new_edge_group), run_time=2)
         self.wait(0.5)
 
         # Pulse edges to show “learning”
-        pulse_edges = VGroup(*[edge.copy().set_color(BLUE_E).set_stroke(width=3, opacity=0.8) for edge in new_edges])
-        self.play(LaggedStartMap(Create, pulse_edges, lag_ratio=0.02), run_time=3)
+        pulse_edges = EdgeBatch(new_positions, new_edge_group.pairs, BLUE_E, opacities=0.8, widths=3)
+        self.play(Create(pulse_edges), run_time=3)
         self.wait(0.5)
 
         # Final explanatory text
@@ -0,0 +1,119 @@
+"""Compile many Tex fragments with one latex run and one dvisvgm run
+
+manim compiles every uncached Tex/MathTex string on its own (one latex
+and one dvisvgm process each). compile_fragments() puts all the missing
+fragments on the pages of a single standalone document, converts every
+page in one dvisvgm call and moves each page to the <hash>.svg file
+manim looks for, so later Tex(...) calls are cache hits.
+"""
+import re
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+
+PAGE_ENV = "ramsatpage"
+DOCUMENTCLASS = re.compile(r"\\documentclass\[([^\]]*)\]\{standalone\}")
+
+
+class Deferred(Exception):
+    """Raised by a gathering stub so a mobject stops once its fragment is recorded"""
+
+
+def _split_document(tex_file):
+    """Return (preamble, body) of a generated manim .tex file"""
+    text = Path(tex_file).read_text(encoding="utf-8")
+    head, rest = text.split("\\begin{document}", 1)
+    body = rest.rsplit("\\end{document}", 1)[0]
+    return head, body
+
+
+def _batch_document(preamble, bodies):
+    """One multi-page standalone document with a page per fragment"""
+    match = DOCUMENTCLASS.search(preamble)
+    if match is None:
+        return None
+    options = match.group(1) + ",multi" if match.group(1) else "multi"
+    preamble = preamble[:match.start()] + f"\\documentclass[{options}]{{standalone}}" + preamble[match.end():]
+    pages = "".join(f"\\begin{{{PAGE_ENV}}}{body}\\end{{{PAGE_ENV}}}\n" for body in bodies)
+    return (f"{preamble}\\newenvironment{{{PAGE_ENV}}}{{}}{{}}\n\\standaloneenv{{{PAGE_ENV}}}\n"
+            f"\\begin{{document}}\n{pages}\\end{{document}}\n")
+
+
+def _compile_command(compiler, output_format, tex_file, out_dir):
+    cmd = [compiler, "-interaction=batchmode", "-halt-on-error", f"-output-directory={out_dir}"]
+    if compiler == "xelatex" and output_format == ".xdv":
+        cmd.append("-no-pdf")
+    return cmd + [str(tex_file)]
+
+
+def _compile_batch(template, svg_files, bodies, preamble, tex_dir):
+    """Compile one group sharing a preamble; return True if every page was produced"""
+    document = _batch_document(preamble, bodies)
+    if document is None:
+        return False
+    with tempfile.TemporaryDirectory(dir=tex_dir, prefix="batch-") as work:
+        work = Path(work)
+        tex_file = work / "batch.tex"
+        tex_file.write_text(document, encoding="utf-8")
+        try:
+            subprocess.run(_compile_command(template.tex_compiler, template.output_format, tex_file, work),
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+            output = tex_file.with_suffix(template.output_format)
+            cmd = ["dvisvgm", str(output), "--page=1-", "--no-fonts", "--verbosity=0",
+                   f"--output={work / 'page-%4p.svg'}"]
+            if template.output_format == ".pdf":
+                cmd.insert(2, "--pdf")
+            subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        except (OSError, subprocess.CalledProcessError):
+            return False
+        # an explicit width, since %p alone pads to the digits of the page count
+        pages = [work / f"page-{i:04d}.svg" for i in range(1, len(bodies) + 1)]
+        if not all(page.exists() for page in pages) or (work / f"page-{len(bodies) + 1:04d}.svg").exists():
+            return False
+        for page, svg in zip(pages, svg_files):
+            shutil.move(str(page), str(svg))
+    return True
+
+
+def compile_fragments(fragments):
+    """Make sure every (expression, environment, tex_template) has its cached SVG
+
+    Returns the number of fragments compiled in batches. A group whose
+    batch fails (a LaTeX error in any fragment, a custom document class)
+    falls back to manim's one-at-a-time compile so errors surface as usual.
+    """
+    from manim import config
+    from manim.utils.tex_file_writing import generate_tex_file, tex_to_svg_file
+
+    groups = {}
+    for expression, environment, tex_template in fragments:
+        template = tex_template or config.tex_template
+        tex_file = Path(generate_tex_file(expression, environment, template))
+        svg = tex_file.with_suffix(".svg")
+        if svg.exists():
+            continue
+        preamble, body = _split_document(tex_file)
+        key = (template.tex_compiler, template.output_format, preamble)
+        group = groups.setdefault(key, {"template": template, "svgs": [], "bodies": [], "fragments": []})
+        if svg in group["svgs"]:
+            continue
+        group["svgs"].append(svg)
+        group["bodies"].append(body)
+        group["fragments"].append((expression, environment, template))
+
+    batched = 0
+    tex_dir = Path(config.get_dir("tex_dir"))
+    tex_dir.mkdir(parents=True, exist_ok=True)
+    for (compiler, output_format, preamble), group in groups.items():
+        if len(group["svgs"]) > 1 and _compile_batch(group["template"], group["svgs"], group["bodies"],
+                                                     preamble, tex_dir):
+            batched += len(group["svgs"])
+            continue
+        for expression, environment, template in group["fragments"]:
+            try:
+                tex_to_svg_file(expression, environment, template)
+            except Exception:
+                # reported again when the mobject itself is built
+                continue
+    return batched
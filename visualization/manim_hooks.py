@@ -0,0 +1,358 @@
+"""In-process manim runner used by main.py for work the manim CLI can't do
+
+Usage:
+  python visualization/manim_hooks.py count <scene file> <SceneClass>
+  python visualization/manim_hooks.py prewarm <job.json>
+  python visualization/manim_hooks.py profile <scene file> <SceneClass> <quality> <output prefix>
+  python visualization/manim_hooks.py storyboard <scene file> <SceneClass> <output png>
+
+Prints a single JSON object on the last line of stdout.
+"""
+import importlib.util
+import inspect
+import json
+import os
+import sys
+import time
+
+# main.py quality names -> manim config presets
+QUALITIES = {
+    "low": "low_quality",
+    "medium": "medium_quality",
+    "high": "high_quality",
+    "production": "production_quality",
+}
+
+
+def load_scene_class(filepath, class_name):
+    """Import a scene file the way manim does and return one of its classes"""
+    filepath = os.path.abspath(filepath)
+    # manim puts the scene's folder on sys.path so sibling helpers import
+    sys.path.insert(0, os.path.dirname(filepath))
+    module_name = os.path.splitext(os.path.basename(filepath))[0]
+    spec = importlib.util.spec_from_file_location(module_name, filepath)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return getattr(module, class_name)
+
+
+def skip_animations_renderer(scene_class):
+    """CairoRenderer that skips animations, with the camera the scene would build
+
+    A renderer passed to Scene() ignores the scene's camera_class, so a
+    ThreeDScene needs its ThreeDCamera handed over explicitly.
+    """
+    from manim.camera.camera import Camera
+    from manim.renderer.cairo_renderer import CairoRenderer
+
+    parameter = inspect.signature(scene_class.__init__).parameters.get("camera_class")
+    camera_class = Camera
+    if parameter is not None and parameter.default is not inspect.Parameter.empty:
+        camera_class = parameter.default
+    return CairoRenderer(camera_class=camera_class, skip_animations=True)
+
+
+def count_animations(filepath, class_name):
+    """Run construct() without drawing frames and return the number of plays
+
+    The count uses the same numbering as manim's ``-n start,end`` (every
+    play() and wait() is one animation).
+    """
+    from manim import tempconfig
+
+    scene_class = load_scene_class(filepath, class_name)
+    with tempconfig({"dry_run": True, "disable_caching": True}):
+        scene = scene_class(renderer=skip_animations_renderer(scene_class))
+        scene.render()
+        return scene.renderer.num_plays
+
+
+def prewarm(job_path):
+    """Build each Tex/Text call in a job so its SVG lands in the shared cache
+
+    The job file holds ``{"media_dir": ..., "calls": [source, ...]}`` where
+    each source is a literal-only call such as ``Tex("R(3,3)", color=RED)``
+    or ``scene:<file>:<class>:<hash>``. For the latter the scene is run
+    with animations skipped and every Tex fragment it builds is gathered,
+    including ones made from loop variables. Returns, per call, the cache
+    files manim read or wrote for it.
+    """
+    import manim
+    from manim import config, tempconfig
+    from manim.mobject.text import tex_mobject, text_mobject
+    from manim.utils.tex_file_writing import generate_tex_file
+
+    with open(job_path) as f:
+        job = json.load(f)
+    config.media_dir = job["media_dir"]
+    namespace = dict(vars(manim))
+    tex_to_svg_file = tex_mobject.tex_to_svg_file
+
+    # First pass: gather every Tex fragment and compile them in one batch
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "animations"))
+    import tex_batch
+
+    fragments = []
+
+    def gather_tex(expression, environment=None, tex_template=None):
+        fragments.append((expression, environment, tex_template))
+        raise tex_batch.Deferred
+
+    tex_mobject.tex_to_svg_file = gather_tex
+    for source in job["calls"]:
+        if source.split("(", 1)[0] in ("Tex", "MathTex"):
+            try:
+                eval(source, namespace)
+            except Exception:
+                pass
+
+    # A running scene needs its Tex to exist, so here the stub hands back a
+    # placeholder glyph instead of stopping the mobject
+    placeholder = os.path.join(os.path.abspath(config.get_dir("tex_dir")), "prewarm_placeholder.svg")
+    os.makedirs(os.path.dirname(placeholder), exist_ok=True)
+    with open(placeholder, "w") as f:
+        f.write('<svg xmlns="http://www.w3.org/2000/svg" width="1" height="1">'
+                '<path d="M0 0H1V1H0Z"/></svg>')
+    scene_fragments = {}
+
+    def gather_scene_tex(expression, environment=None, tex_template=None):
+        fragment = (expression, environment, tex_template)
+        fragments.append(fragment)
+        scene_fragments[current].append(fragment)
+        return placeholder
+
+    tex_mobject.tex_to_svg_file = gather_scene_tex
+    scene_errors = {}
+    for source in job["calls"]:
+        if not source.startswith("scene:"):
+            continue
+        current = source
+        scene_fragments[source] = []
+        filepath, class_name, _ = source[len("scene:"):].rsplit(":", 2)
+        try:
+            scene_class = load_scene_class(filepath, class_name)
+            with tempconfig({"dry_run": True, "disable_caching": True}):
+                scene_class(renderer=skip_animations_renderer(scene_class)).render()
+        except Exception as e:
+            # scenes that index into a Tex's glyphs may trip over the
+            # placeholder; what was gathered up to there is still compiled
+            scene_errors[source] = f"{type(e).__name__}: {e}"
+    os.remove(placeholder)
+    tex_batch.compile_fragments(fragments)
+
+    # Second pass: build every mobject for real, recording the files it used
+    produced = []
+
+    def record_tex(*args, **kwargs):
+        path = tex_to_svg_file(*args, **kwargs)
+        produced.append(str(path))
+        return path
+
+    tex_mobject.tex_to_svg_file = record_tex
+    for cls in (text_mobject.Text, text_mobject.MarkupText):
+        def record_text(self, *args, _original=cls._text2svg, **kwargs):
+            path = _original(self, *args, **kwargs)
+            produced.append(str(path))
+            return path
+        cls._text2svg = record_text
+
+    results = []
+    for source in job["calls"]:
+        if source in scene_fragments:
+            files = set()
+            for expression, environment, tex_template in scene_fragments[source]:
+                svg = os.path.splitext(generate_tex_file(expression, environment,
+                                                         tex_template or config.tex_template))[0] + ".svg"
+                if os.path.exists(svg):
+                    files.add(svg)
+            if files or source not in scene_errors:
+                results.append({"source": source, "files": sorted(files)})
+            else:
+                results.append({"source": source, "files": [], "error": scene_errors[source]})
+            continue
+        produced.clear()
+        try:
+            eval(source, namespace)
+            results.append({"source": source, "files": sorted(set(produced))})
+        except Exception as e:
+            results.append({"source": source, "files": [], "error": f"{type(e).__name__}: {e}"})
+    return results
+
+
+def _animation_label(animation):
+    """Short name for a play() argument, e.g. Create, LaggedStart[45], animate"""
+    name = type(animation).__name__
+    if name == "_AnimationBuilder":
+        return "animate"
+    if hasattr(animation, "animations"):
+        return f"{name}[{len(animation.animations)}]"
+    return name
+
+
+def wrap_scene_calls(scene_file, on_call):
+    """Patch Scene.play/Scene.wait to report each outermost call
+
+    ``on_call(scene, kind, args, line, wall, scene_time)`` runs after each
+    call, where line is the calling line in scene_file and scene_time the
+    renderer clock before the call. wait() goes through play(), so nested
+    calls are not reported twice.
+    """
+    from manim.scene.scene import Scene
+
+    scene_file = os.path.abspath(scene_file)
+    active = []
+
+    def caller_line():
+        for frame in inspect.stack()[2:]:
+            if os.path.abspath(frame.filename) == scene_file:
+                return frame.lineno
+        return None
+
+    def wrap(kind, original):
+        def wrapper(self, *args, **kwargs):
+            if active:
+                return original(self, *args, **kwargs)
+            active.append(kind)
+            line = caller_line()
+            scene_time = getattr(self.renderer, "time", 0.0)
+            start = time.perf_counter()
+            try:
+                return original(self, *args, **kwargs)
+            finally:
+                wall = time.perf_counter() - start
+                active.pop()
+                on_call(self, kind, args, line, wall, scene_time)
+        return wrapper
+
+    Scene.play = wrap("play", Scene.play)
+    Scene.wait = wrap("wait", Scene.wait)
+
+
+def profile_scene(filepath, class_name, quality, output_prefix):
+    """Render a scene while timing every play() and wait() it makes
+
+    Writes ``<prefix>.json`` (one record per animation: construct() line,
+    wall time, frames written and mobject counts) and ``<prefix>.folded``
+    (scene;line;animations microseconds) for flame graph tools.
+    """
+    from manim import config, tempconfig
+
+    scene_class = load_scene_class(filepath, class_name)
+    records = []
+
+    def record(scene, kind, args, line, wall, scene_time):
+        labels = [_animation_label(arg) for arg in args] if kind == "play" else ["Wait"]
+        records.append({
+            "index": len(records),
+            "kind": kind,
+            "line": line,
+            "animations": labels,
+            "wall_s": wall,
+            "frames": round((getattr(scene.renderer, "time", 0.0) - scene_time) * config.frame_rate),
+            "mobjects": len(scene.mobjects),
+            "family": sum(len(mob.get_family()) for mob in scene.mobjects),
+        })
+
+    wrap_scene_calls(filepath, record)
+
+    media_dir = os.path.dirname(os.path.abspath(output_prefix))
+    with tempconfig({
+        "quality": QUALITIES.get(quality, "high_quality"),
+        "media_dir": os.path.join(media_dir, "media"),
+        "tex_dir": os.path.abspath(os.path.join("media", "Tex")),
+        "text_dir": os.path.abspath(os.path.join("media", "texts")),
+        "disable_caching": True,
+    }):
+        start = time.perf_counter()
+        scene = scene_class()
+        scene.render()
+        total = time.perf_counter() - start
+
+    stem = os.path.basename(filepath)
+    report = {
+        "scene": class_name,
+        "file": filepath,
+        "quality": quality,
+        "total_wall_s": total,
+        "animation_wall_s": sum(record["wall_s"] for record in records),
+        "animations": records,
+    }
+    with open(output_prefix + ".json", "w") as f:
+        json.dump(report, f, indent=1)
+    with open(output_prefix + ".folded", "w") as f:
+        for record in records:
+            label = "+".join(record["animations"]) or record["kind"]
+            f.write(f"{class_name};{stem}:{record['line']};{label} {int(record['wall_s'] * 1e6)}\n")
+    return report
+
+
+def storyboard(filepath, class_name, output_png, columns=4, thumb_width=360):
+    """Tile the last frame of every play() into one contact sheet, skipping interpolation
+
+    Like manim's -s but per animation: the scene runs with animations
+    skipped, and after each play() the current state is drawn once.
+    """
+    from manim import tempconfig
+    from PIL import Image, ImageDraw
+
+    scene_class = load_scene_class(filepath, class_name)
+    frames = []
+
+    def capture(scene, kind, args, line, wall, scene_time):
+        if kind != "play":
+            return
+        scene.renderer.update_frame(scene)
+        image = Image.fromarray(scene.renderer.get_frame()).convert("RGB")
+        image.thumbnail((thumb_width, thumb_width))
+        labels = ", ".join(_animation_label(arg) for arg in args)
+        frames.append((image, f"#{len(frames)}  line {line}: {labels}"))
+
+    wrap_scene_calls(filepath, capture)
+    with tempconfig({
+        "quality": "low_quality",
+        "dry_run": True,
+        "disable_caching": True,
+        "tex_dir": os.path.abspath(os.path.join("media", "Tex")),
+        "text_dir": os.path.abspath(os.path.join("media", "texts")),
+    }):
+        scene = scene_class(renderer=skip_animations_renderer(scene_class))
+        scene.render()
+
+    if not frames:
+        return 0
+    caption = 16
+    cell_w = max(image.width for image, _ in frames)
+    cell_h = max(image.height for image, _ in frames) + caption
+    rows = (len(frames) + columns - 1) // columns
+    sheet = Image.new("RGB", (columns * cell_w, rows * cell_h), "black")
+    draw = ImageDraw.Draw(sheet)
+    for i, (image, label) in enumerate(frames):
+        x, y = (i % columns) * cell_w, (i // columns) * cell_h
+        sheet.paste(image, (x, y))
+        draw.text((x + 4, y + image.height + 2), label[:60], fill="white")
+    os.makedirs(os.path.dirname(os.path.abspath(output_png)), exist_ok=True)
+    sheet.save(output_png)
+    return len(frames)
+
+
+def main():
+    if len(sys.argv) == 4 and sys.argv[1] == "count":
+        _, command, filepath, class_name = sys.argv
+        print(json.dumps({"animations": count_animations(filepath, class_name)}))
+    elif len(sys.argv) == 3 and sys.argv[1] == "prewarm":
+        print(json.dumps({"results": prewarm(sys.argv[2])}))
+    elif len(sys.argv) == 6 and sys.argv[1] == "profile":
+        _, command, filepath, class_name, quality, output_prefix = sys.argv
+        report = profile_scene(filepath, class_name, quality, output_prefix)
+        print(json.dumps({"animations": len(report["animations"]), "total_wall_s": report["total_wall_s"]}))
+    elif len(sys.argv) == 5 and sys.argv[1] == "storyboard":
+        _, command, filepath, class_name, output_png = sys.argv
+        print(json.dumps({"frames": storyboard(filepath, class_name, output_png)}))
+    else:
+        print(__doc__)
+        sys.exit(2)
+
+
+if __name__ == "__main__":
+    main()